@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+APIClient Load Benchmark
+Drives APIClient against the local mock server and reports throughput,
+latency percentiles, retry counts and peak RSS, so scheduler and retry
+changes can be measured offline without spending real tokens.
+
+Usage:
+    python tools/articles/benchmark-api-client.py [--prompts 1000] [--concurrency 100]
+        [--endpoints 2] [--hedge] [--latency-median 0.2] [--error-429 0.01] [--server-rps 50] [--error-5xx 0.01]
+        [--json results.json] [--baseline previous.json]
+"""
+
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import time
+
+# Add modules directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
+
+from api_client import APIClient
+from file_writer import FileWriter
+from mock_server import MockAPIServer
+
+
+def find_free_port() -> int:
+    """Reserve a free local TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run_server(settings: dict, port: int):
+    """Run the mock server in a child process until terminated."""
+    async def serve():
+        server = MockAPIServer(settings, port=port)
+        await server.start()
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+async def wait_for_port(port: int, timeout: float = 10.0):
+    """Wait until the mock server accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"Mock server did not start on port {port}")
+
+
+async def run_benchmark(config: dict, num_prompts: int, concurrency: int, mode: str) -> dict:
+    """
+    Run one benchmark pass.
+
+    Args:
+        config: APIClient configuration pointing at the mock server
+        num_prompts: Number of prompts to send
+        concurrency: Request window size
+        mode: 'batch' (generate_articles_batch) or 'stream' (stream_articles)
+
+    Returns:
+        Dictionary of results
+    """
+    client = APIClient(config)
+    writer = FileWriter('/dev/null/', config['site_domain'])
+    client.set_validator(lambda content: writer.validate_mdx_content(content)[0])
+
+    prompts = (
+        (f"Benchmark prompt {i}", {'title': f"Article {i}", 'url_path': f"/bench/article-{i}/"})
+        for i in range(num_prompts)
+    )
+
+    valid = 0
+    invalid = 0
+    failed = 0
+
+    def check(content):
+        nonlocal valid, invalid, failed
+        if content is None:
+            failed += 1
+        elif writer.validate_mdx_content(content)[0]:
+            valid += 1
+        else:
+            invalid += 1
+
+    started = time.perf_counter()
+    if mode == 'batch':
+        results = await client.generate_articles_batch(list(prompts), batch_size=concurrency)
+        for _, content in results:
+            check(content)
+    else:
+        async for _, _, content in client.stream_articles(prompts, batch_size=concurrency, total=num_prompts):
+            check(content)
+    elapsed = time.perf_counter() - started
+
+    stats = client.get_stats()
+    return {
+        'mode': mode,
+        'prompts': num_prompts,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 2),
+        'throughput_per_second': round(num_prompts / elapsed, 2),
+        'latency': client.get_latency_percentiles(),
+        'retries': stats['retries'],
+        'early_aborts': stats['early_aborts'],
+        'continuations': stats['continuations'],
+        'truncated_articles': stats['truncated_articles'],
+        'candidates_used': {str(key): value for key, value in client.candidate_usage.items()},
+        'fatal_errors': stats['fatal_errors'],
+        'circuit_trips': client.circuit_breaker.stats['trips'],
+        'hedges_fired': stats['hedges_fired'],
+        'hedges_won': stats['hedges_won'],
+        'connections_created': stats['connections_created'],
+        'connection_reuse_rate': stats['connection_reuse_rate'],
+        'streaming': client.get_streaming_stats() if client.stream else None,
+        'rate_limited': client.endpoint_pool.get_stats()['rate_limited'],
+        'endpoints': len(client.endpoint_pool.endpoints),
+        'failovers': client.endpoint_pool.stats['failovers'],
+        'valid': valid,
+        'invalid': invalid,
+        'failed': failed,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def print_results(results: dict):
+    """Print formatted benchmark results."""
+    latency = results['latency']
+
+    print("\n" + "=" * 60)
+    print("🏁 BENCHMARK RESULTS")
+    print("=" * 60)
+    print(f"Mode:                 {results['mode']}")
+    print(f"Prompts:              {results['prompts']}")
+    print(f"Concurrency:          {results['concurrency']}")
+    if results['endpoints'] > 1:
+        print(f"Endpoints:            {results['endpoints']} ({results['failovers']} failovers)")
+    print(f"Duration:             {results['duration_seconds']}s")
+    print(f"Throughput:           {results['throughput_per_second']} articles/s")
+    print(f"Latency p50:          {latency['p50']}s")
+    print(f"Latency p95:          {latency['p95']}s")
+    print(f"Latency p99:          {latency['p99']}s")
+    print(f"Retries:              {results['retries']}")
+    print(f"Fatal (not retried):  {results['fatal_errors']}")
+    print(f"Circuit Trips:        {results['circuit_trips']}")
+    if results['hedges_fired']:
+        print(f"Hedges Fired / Won:   {results['hedges_fired']} / {results['hedges_won']}")
+    print(f"Connections Opened:   {results['connections_created']} "
+          f"(reuse {results['connection_reuse_rate']}%)")
+    if results['streaming']:
+        print(f"TTFT p50/p95:         {results['streaming']['ttft_p50']}s / {results['streaming']['ttft_p95']}s")
+        print(f"Tokens/Second (avg):  {results['streaming']['tokens_per_second']}")
+        print(f"Early Aborts:         {results['early_aborts']}")
+    if results.get('continuations') or results.get('truncated_articles'):
+        print(f"Continuations:        {results['continuations']} "
+              f"({results['truncated_articles']} still truncated)")
+    if results.get('candidates_used'):
+        summary = ', '.join(f"{key}={value}" for key, value in sorted(results['candidates_used'].items()))
+        print(f"Candidate Used:       {summary}")
+    print(f"Rate Limited (429):   {results['rate_limited']}")
+    print(f"Valid / Invalid MDX:  {results['valid']} / {results['invalid']}")
+    print(f"Failed:               {results['failed']}")
+    print(f"Peak RSS:             {results['peak_rss_mb']} MB")
+    print("=" * 60 + "\n")
+
+
+def compare_with_baseline(results: dict, baseline_path: str, tolerance: float) -> bool:
+    """
+    Compare results with a previous run.
+
+    Args:
+        results: Current results
+        baseline_path: Path to a JSON file written with --json
+        tolerance: Allowed relative regression (0.1 = 10%)
+
+    Returns:
+        bool: True if no metric regressed beyond the tolerance
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    checks = [
+        ('throughput', results['throughput_per_second'], baseline['throughput_per_second'], True),
+        ('latency p95', results['latency']['p95'], baseline['latency']['p95'], False),
+        ('latency p99', results['latency']['p99'], baseline['latency']['p99'], False),
+        ('peak RSS', results['peak_rss_mb'], baseline['peak_rss_mb'], False)
+    ]
+
+    ok = True
+    print("📏 Comparison with baseline:")
+    for name, current, previous, higher_is_better in checks:
+        if not previous:
+            continue
+        change = (current - previous) / previous
+        regressed = change < -tolerance if higher_is_better else change > tolerance
+        ok = ok and not regressed
+        print(f"  {'❌' if regressed else '✅'} {name:12s}: {previous} → {current} ({change:+.1%})")
+    print()
+
+    return ok
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark APIClient against a local mock server')
+    parser.add_argument('--config', type=str, default='tools/articles/config.json')
+    parser.add_argument('--prompts', type=int, default=1000, help='Number of prompts (default: 1000)')
+    parser.add_argument('--concurrency', type=int, default=100, help='Requests in flight (default: 100)')
+    parser.add_argument('--mode', choices=['batch', 'stream'], default='batch',
+                        help='Drive generate_articles_batch or stream_articles (default: batch)')
+    parser.add_argument('--endpoints', type=int, default=1,
+                        help='Mock endpoints to spread the load over (default: 1)')
+    parser.add_argument('--degraded-5xx', type=float, default=0.0,
+                        help='5xx fraction on the last endpoint, to exercise failover')
+    parser.add_argument('--hedge', action='store_true', help='Enable request hedging')
+    parser.add_argument('--stream', action='store_true', help='Use SSE streaming responses')
+    parser.add_argument('--candidates', type=int, default=1, help='Candidates per article (default: 1)')
+    parser.add_argument('--candidate-mode', choices=['parallel', 'fallback'], default='parallel',
+                        help='Request candidates as n in one call or one at a time')
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-median', type=float, default=0.2, help='Median latency in seconds')
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help='Lognormal sigma')
+    parser.add_argument('--error-429', type=float, default=0.0, help='Fraction of 429 responses')
+    parser.add_argument('--server-rps', type=float, default=0, help='Requests/second quota enforced by the server')
+    parser.add_argument('--error-5xx', type=float, default=0.0, help='Fraction of 5xx responses')
+    parser.add_argument('--error-4xx', type=float, default=0.0, help='Fraction of non-retryable 400 responses')
+    parser.add_argument('--truncated', type=float, default=0.0, help='Fraction of truncated bodies')
+    parser.add_argument('--invalid', type=float, default=0.0, help='Fraction of invalid MDX bodies')
+    parser.add_argument('--retry-after', type=float, default=1, help='Retry-After sent with 429s')
+    parser.add_argument('--body-words', type=int, default=300, help='Words per mock article')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--verbose', action='store_true', help='Show per-request client output')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file')
+    parser.add_argument('--baseline', type=str, help='Fail if results regress against this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed regression (default: 0.1)')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    settings = {
+        'latency': args.latency,
+        'latency_median': args.latency_median,
+        'latency_sigma': args.latency_sigma,
+        'rate_429': args.error_429,
+        'rate_limit_rps': args.server_rps,
+        'rate_5xx': args.error_5xx,
+        'rate_4xx': args.error_4xx,
+        'rate_truncated': args.truncated,
+        'rate_invalid': args.invalid,
+        'retry_after': args.retry_after,
+        'body_words': args.body_words,
+        'seed': args.seed
+    }
+
+    ports = [find_free_port() for _ in range(max(1, args.endpoints))]
+    servers = []
+    for index, port in enumerate(ports):
+        endpoint_settings = dict(settings)
+        if args.degraded_5xx and index == len(ports) - 1:
+            endpoint_settings['rate_5xx'] = args.degraded_5xx
+        server = multiprocessing.Process(target=run_server, args=(endpoint_settings, port), daemon=True)
+        server.start()
+        servers.append(server)
+
+    # Point the client at the mock servers and keep the benchmark hermetic
+    config['api_base_url'] = f"http://127.0.0.1:{ports[0]}/v1/chat/completions"
+    config['api_key'] = 'mock-key'
+    config['concurrent_limit'] = max(config.get('concurrent_limit', 100), args.concurrency)
+    config['endpoints'] = []
+    if len(ports) > 1:
+        config['endpoints'] = [
+            {
+                'name': f"mock-{index + 1}",
+                'api_base_url': f"http://127.0.0.1:{port}/v1/chat/completions",
+                'api_key': f"mock-key-{index + 1}",
+                'concurrent_limit': -(-args.concurrency // len(ports))
+            }
+            for index, port in enumerate(ports)
+        ]
+    config['response_cache'] = {'enabled': False}
+    config['cache_only'] = False
+    config['max_tokens_tuning'] = {'enabled': False}
+    config['stream'] = args.stream
+    config['candidates'] = {'count': args.candidates, 'mode': args.candidate_mode}
+    if args.hedge:
+        config['hedging'] = dict(config.get('hedging', {}), enabled=True)
+
+    print(f"🧪 Benchmarking {args.prompts} prompts at concurrency {args.concurrency} ({args.mode} mode)")
+
+    async def run():
+        for port in ports:
+            await wait_for_port(port)
+        if args.verbose:
+            return await run_benchmark(config, args.prompts, args.concurrency, args.mode)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return await run_benchmark(config, args.prompts, args.concurrency, args.mode)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        for server in servers:
+            server.terminate()
+            server.join()
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}\n")
+
+    if args.baseline and not compare_with_baseline(results, args.baseline, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
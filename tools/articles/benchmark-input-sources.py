@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Input Source Benchmark
+Writes the same synthetic article sheet in every supported input format
+and measures how fast ExcelParser reads each one, in table and streaming
+mode. Every pass runs in its own process so peak RSS is comparable.
+
+Usage:
+    python tools/articles/benchmark-input-sources.py [--rows 100000]
+        [--formats xlsx,csv,jsonl,json,parquet] [--modes table,stream] [--dir /tmp/input-bench]
+        [--json results.json]
+"""
+
+import contextlib
+import csv
+import importlib.util
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+# Add modules directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
+
+from excel_parser import ExcelParser
+
+
+HEADER = ['Priority', 'URL Path', 'Article Title', 'Keyword', 'Reference Link']
+CATEGORIES = ['bosses', 'builds', 'codes', 'guides', 'locations', 'weapons', 'walkthrough']
+
+
+def synthetic_rows(count: int):
+    """Yield synthetic sheet rows in HEADER order."""
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        yield [
+            i % 4 + 1,
+            f"/{category}/article-{i}/",
+            f"Article {i}: Complete {category.title()} Guide",
+            f"where winds meet {category} {i}",
+            f"https://example.com/{category}/{i}"
+        ]
+
+
+def write_inputs(directory: str, rows: int, formats: list) -> dict:
+    """
+    Write the synthetic sheet once per format.
+
+    Args:
+        directory: Output directory
+        rows: Number of data rows
+        formats: Formats to write
+
+    Returns:
+        Dictionary mapping format to file path
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for file_format in formats:
+        path = os.path.join(directory, f"articles-{rows}.{file_format}")
+        paths[file_format] = path
+        if os.path.exists(path):
+            continue
+
+        started = time.perf_counter()
+        if file_format == 'xlsx':
+            import openpyxl
+            workbook = openpyxl.Workbook(write_only=True)
+            sheet = workbook.create_sheet()
+            sheet.append(HEADER)
+            for row in synthetic_rows(rows):
+                sheet.append(row)
+            workbook.save(path)
+        elif file_format == 'csv':
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(HEADER)
+                writer.writerows(synthetic_rows(rows))
+        elif file_format == 'jsonl':
+            with open(path, 'w', encoding='utf-8') as f:
+                for row in synthetic_rows(rows):
+                    f.write(json.dumps(dict(zip(HEADER, row)), ensure_ascii=False) + '\n')
+        elif file_format == 'json':
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([dict(zip(HEADER, row)) for row in synthetic_rows(rows)], f, ensure_ascii=False)
+        elif file_format == 'parquet':
+            import pandas as pd
+            pd.DataFrame(list(synthetic_rows(rows)), columns=HEADER).to_parquet(path, index=False)
+        print(f"📝 Wrote {path} in {time.perf_counter() - started:.1f}s")
+    return paths
+
+
+def measure(path: str, streaming: bool, queue):
+    """Parse one input in a child process and report timing and peak RSS."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        parser = ExcelParser(path, streaming=streaming)
+        loaded = parser.load_data()
+        articles = sum(1 for _ in parser.iter_articles()) if loaded else 0
+        duration = time.perf_counter() - started
+
+    queue.put({
+        'articles': articles,
+        'duration_seconds': round(duration, 3),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    })
+
+
+def run_pass(path: str, streaming: bool) -> dict:
+    """Run measure() in a fresh process."""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=measure, args=(path, streaming, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def print_results(results: list):
+    """Print formatted benchmark results."""
+    print("\n" + "=" * 60)
+    print("🏁 INPUT SOURCE BENCHMARK")
+    print("=" * 60)
+    print(f"{'Format':<8} {'Mode':<7} {'Size':>9} {'Time':>8} {'Rows/s':>10} {'Peak RSS':>10}")
+    for result in results:
+        print(f"{result['format']:<8} {result['mode']:<7} "
+              f"{result['file_mb']:>7.1f}MB {result['duration_seconds']:>7.2f}s "
+              f"{result['rows_per_second']:>10,} {result['peak_rss_mb']:>8.1f}MB")
+    print("=" * 60 + "\n")
+
+
+def main():
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark ExcelParser across input formats')
+    parser.add_argument('--rows', type=int, default=100000, help='Rows in the synthetic sheet (default: 100000)')
+    parser.add_argument('--formats', type=str, default='xlsx,csv,jsonl,json,parquet',
+                        help='Comma-separated formats to compare')
+    parser.add_argument('--modes', type=str, default='table,stream',
+                        help='Comma-separated parse modes: table (DataFrame) and/or stream')
+    parser.add_argument('--dir', type=str, default=os.path.join(tempfile.gettempdir(), 'input-bench'),
+                        help='Where the synthetic inputs are written (kept between runs)')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+    if 'parquet' in formats and not importlib.util.find_spec('pyarrow'):
+        print("⚠️  pyarrow is not installed, skipping Parquet")
+        formats.remove('parquet')
+    modes = [name.strip() for name in args.modes.split(',') if name.strip()]
+
+    print(f"🧪 Benchmarking {args.rows} rows: {', '.join(formats)} ({', '.join(modes)})")
+    paths = write_inputs(args.dir, args.rows, formats)
+
+    results = []
+    for file_format in formats:
+        for mode in modes:
+            result = run_pass(paths[file_format], streaming=(mode == 'stream'))
+            result.update({
+                'format': file_format,
+                'mode': mode,
+                'file_mb': round(os.path.getsize(paths[file_format]) / 1024 / 1024, 1),
+                'rows_per_second': int(result['articles'] / result['duration_seconds'])
+                if result['duration_seconds'] else 0
+            })
+            if result['articles'] != args.rows:
+                print(f"⚠️  {file_format} ({mode}) returned {result['articles']} of {args.rows} rows")
+            results.append(result)
+
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.json}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,44 @@ Article Generation Script
 Main script to generate MDX articles using GPT-4o API.
 
 Usage:
-    python generate-articles.py [--batch-size 100] [--overwrite] [--test]
+    python generate-articles.py [--batch-size 100] [--overwrite] [--incremental] [--resume]
+        [--time-budget 3600] [--batch-api] [--test]
 """
 
 import asyncio
+import itertools
 import json
 import os
+import re
 import sys
+import time
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Startup is timed from before the heavy imports (pandas, aiohttp)
+STARTED = time.perf_counter()
 
 # Add modules directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'modules'))
 
 from excel_parser import ExcelParser
 from api_client import APIClient
+from batch_client import BatchClient
 from file_writer import FileWriter
 from internal_links import InternalLinksManager
+from manifest import ArticleManifest
+from journal import RunJournal
+from metrics import MetricsRegistry
+from scheduler import PriorityScheduler
+
+
+# Line separating the shared instructions from the per-article block in a prefix-layout template
+ARTICLE_MARKER = '<<<ARTICLE>>>'
+
+# Publish date in prompts: a fixed value keeps each prompt (and its response cache key)
+# the same from day to day; the real date is written into the front matter on save
+DATE_PLACEHOLDER = 'YYYY-MM-DD'
+FRONT_MATTER_DATE = re.compile(r'^date:.*$', re.MULTILINE)
 
 
 class ArticleGenerator:
@@ -37,9 +58,17 @@ class ArticleGenerator:
         self.config = None
         self.excel_parser = None
         self.api_client = None
+        self.batch_client = None
         self.file_writer = None
         self.links_manager = None
+        self.manifest = None
+        self.journal = None
+        self.metrics = None
+        self.resumed = {}
+        self.counts = {'total': 0, 'saved': 0, 'failed': 0, 'recovered': 0}
         self.prompt_template = None
+        self.article_template = None
+        self.static_instructions = None
 
     def load_config(self) -> bool:
         """Load configuration from JSON file."""
@@ -53,12 +82,37 @@ class ArticleGenerator:
             return False
 
     def load_prompt_template(self) -> bool:
-        """Load prompt template from file."""
+        """
+        Load prompt template from file.
+
+        The 'inline' layout formats the whole template into the user message.
+        The 'prefix' layout splits the template at ARTICLE_MARKER: the static
+        instructions above it are sent as a byte-identical system message so
+        the provider can cache that prefix, and only the per-article block
+        below it is formatted into the user message.
+        """
         try:
-            template_path = 'tools/articles/prompt-template.txt'
+            layout = self.config.get('prompt_layout', 'inline')
+            if layout == 'prefix':
+                template_path = self.config.get(
+                    'prefix_template_file', 'tools/articles/prompt-template-prefix.txt'
+                )
+            else:
+                template_path = 'tools/articles/prompt-template.txt'
             with open(template_path, 'r', encoding='utf-8') as f:
                 self.prompt_template = f.read()
-            print(f"✅ Prompt template loaded")
+
+            if layout == 'prefix':
+                static, marker, article = self.prompt_template.partition(ARTICLE_MARKER)
+                if not marker:
+                    print(f"❌ Prefix template {template_path} has no {ARTICLE_MARKER} line")
+                    return False
+                self.static_instructions = static.strip()
+                self.article_template = article.strip()
+            else:
+                self.article_template = self.prompt_template
+
+            print(f"✅ Prompt template loaded ({layout} layout)")
             return True
         except Exception as e:
             print(f"❌ Error loading prompt template: {str(e)}")
@@ -70,33 +124,34 @@ class ArticleGenerator:
             # Initialize Excel parser with priority filter
             self.excel_parser = ExcelParser(
                 self.config['excel_file'],
-                priority_range=self.priority_range
+                priority_range=self.priority_range,
+                cache_dir=self.config.get('workbook_cache_dir', 'tools/articles/cache/workbooks') or None,
+                streaming=self.config.get('excel_streaming', False)
             )
             if not self.excel_parser.load_data():
                 return False
 
-            # Display priority statistics
-            self.excel_parser.print_priority_stats()
+            # In streaming mode both are gathered while the rows are read instead
+            if not self.excel_parser.streaming:
+                self.print_input_report()
 
-            # Validate URL paths (only check format, not categories)
-            errors = self.excel_parser.validate_url_paths()
-            if errors:
-                print(f"\n⚠️  Found {len(errors)} URL format errors:")
-                for error in errors[:3]:
-                    print(f"  - {error}")
-                if len(errors) > 3:
-                    print(f"  ... and {len(errors) - 3} more")
-                print()
+            # Shared metrics registry for the whole pipeline
+            self.metrics = MetricsRegistry()
 
             # Initialize API client
-            self.api_client = APIClient(self.config)
+            self.api_client = APIClient(self.config, metrics=self.metrics)
+            if self.static_instructions:
+                self.api_client.set_static_instructions(self.static_instructions)
             print("✅ API client initialized")
 
             # Initialize file writer
             self.file_writer = FileWriter(
                 self.config['output_dir'],
-                self.config['site_domain']
+                self.config['site_domain'],
+                metrics=self.metrics
             )
+            self.metrics.add_collector(self.file_writer.collect_gauges)
+            self.api_client.set_validator(lambda content: self.file_writer.validate_mdx_content(content)[0])
             print("✅ File writer initialized")
 
             # Initialize internal links manager
@@ -106,12 +161,47 @@ class ArticleGenerator:
             )
             print("✅ Internal links manager initialized")
 
+            # Initialize manifest of generated rows (used by incremental mode)
+            self.manifest = ArticleManifest(
+                self.config.get('manifest_file', 'tools/articles/cache/manifest.json'),
+                ArticleManifest.build_fingerprint(
+                    self.config['model'],
+                    self.config['temperature'],
+                    self.prompt_template
+                )
+            )
+            if self.manifest.load():
+                print(f"✅ Manifest loaded ({len(self.manifest.entries)} tracked articles)")
+
+            # Initialize checkpoint journal (used by --resume)
+            self.journal = RunJournal(
+                self.config.get('journal_file', 'tools/articles/logs/journal.jsonl')
+            )
+
             return True
 
         except Exception as e:
             print(f"❌ Error initializing modules: {str(e)}")
             return False
 
+    def print_input_report(self):
+        """Print priority statistics and URL format errors of the input sheet."""
+        if self.excel_parser.streaming and not self.excel_parser.stream_complete:
+            print("\nℹ️  Input statistics cover only the rows read before generation stopped")
+
+        # Display priority statistics
+        self.excel_parser.print_priority_stats()
+
+        # Validate URL paths (only check format, not categories)
+        errors = self.excel_parser.validate_url_paths()
+        if errors:
+            print(f"\n⚠️  Found {len(errors)} URL format errors:")
+            for error in errors[:3]:
+                print(f"  - {error}")
+            if len(errors) > 3:
+                print(f"  ... and {len(errors) - 3} more")
+            print()
+
     def build_prompt(self, article: Dict) -> str:
         """
         Build prompt for article generation.
@@ -129,109 +219,299 @@ class ArticleGenerator:
         )
         formatted_links = self.links_manager.format_links_for_prompt(internal_links)
 
-        # Get current date
-        current_date = datetime.now().strftime('%Y-%m-%d')
-
-        # Build prompt from template
-        prompt = self.prompt_template.format(
+        # Build prompt from template (only the per-article block in the prefix layout)
+        prompt = self.article_template.format(
             url_path=article['url_path'],
             article_title=article['title'],
             keyword=article['keyword'],
             reference_link=article['reference'] or 'No reference provided',
             internal_links=formatted_links,
-            current_date=current_date
+            current_date=DATE_PLACEHOLDER
         )
 
         return prompt
 
+    def stamp_publish_date(self, content: str) -> str:
+        """
+        Set the front matter date of a generated article to today.
+
+        Prompts only carry DATE_PLACEHOLDER, so generated and cached outputs
+        are dated when they are written, not when they were requested.
+
+        Args:
+            content: Generated MDX content
+
+        Returns:
+            Content with its front matter date set to today
+        """
+        end = content.find('\n---', 3)
+        if not content.startswith('---') or end == -1:
+            return content
+        current_date = datetime.now().strftime('%Y-%m-%d')
+        front_matter = FRONT_MATTER_DATE.sub(f'date: "{current_date}"', content[:end], count=1)
+        return front_matter + content[end:]
+
+    def iter_pending(
+        self,
+        articles: Iterable[Dict],
+        overwrite: bool = False,
+        incremental: bool = False
+    ) -> Iterator[Dict]:
+        """
+        Drop articles that do not need an API call, before any request is made.
+
+        Without --overwrite, existing files are skipped. In incremental mode an
+        existing file is regenerated only when its row hash (row fields plus
+        model/temperature/template) differs from the manifest; existing files
+        with no manifest entry are adopted as current.
+
+        Args:
+            articles: Iterable of article metadata dictionaries
+            overwrite: Whether existing files are regenerated anyway
+            incremental: Whether changed rows are regenerated over existing files
+
+        Yields:
+            Articles that should be generated
+        """
+        for article in articles:
+            previous = self.resumed.get(article['url_path'])
+            if previous and previous['state'] == RunJournal.WRITTEN:
+                self.file_writer.mark_skipped(article, "written before interruption")
+                continue
+            if previous and previous.get('content'):
+                # The API call already succeeded last time; only validate and write
+                print(f"♻️  Recovered {article['url_path']} from journal (no API call)")
+                self.counts['recovered'] += 1
+                self.save_result(article, previous['content'], overwrite or incremental)
+                continue
+
+            if overwrite or not self.file_writer.article_exists(article['url_path']):
+                self.journal.record(RunJournal.QUEUED, article)
+                yield article
+                continue
+
+            if not incremental:
+                self.file_writer.mark_skipped(article, "already exists")
+                continue
+
+            if not self.manifest.is_tracked(article):
+                self.manifest.record(article)
+                self.file_writer.mark_skipped(article, "exists, adopted into manifest")
+            elif self.manifest.is_current(article):
+                self.file_writer.mark_skipped(article, "unchanged")
+            else:
+                self.journal.record(RunJournal.QUEUED, article)
+                yield article
+
+    def record_completion(self, article_info: Dict, content: Optional[str]):
+        """
+        Journal the outcome of an API call the moment it finishes.
+
+        Args:
+            article_info: Dictionary with article metadata
+            content: Generated content, or None if the call failed
+        """
+        if content:
+            self.journal.record(RunJournal.SUCCEEDED, article_info, content=content)
+        else:
+            self.journal.record(RunJournal.FAILED, article_info, reason="API generation failed")
+
+    def save_result(self, article_info: Dict, content: Optional[str], overwrite: bool):
+        """
+        Validate and write one generated article, journaling each step.
+
+        Args:
+            article_info: Dictionary with article metadata
+            content: Generated content, or None if the call failed
+            overwrite: Whether an existing file may be replaced
+        """
+        self.counts['total'] += 1
+
+        if not content:
+            self.file_writer.save_failed_article(
+                article_info,
+                "API generation failed"
+            )
+            self.counts['failed'] += 1
+            return
+
+        content = self.stamp_publish_date(content)
+        is_valid, error_msg = self.file_writer.validate_mdx_content(content)
+        if is_valid:
+            self.journal.record(RunJournal.VALIDATED, article_info)
+        else:
+            self.journal.record(RunJournal.FAILED, article_info, reason=error_msg)
+
+        if self.file_writer.save_article(content, article_info, overwrite=overwrite):
+            self.journal.record(RunJournal.WRITTEN, article_info)
+            self.counts['saved'] += 1
+            self.manifest.record(article_info)
+        elif is_valid:
+            self.journal.record(RunJournal.FAILED, article_info, reason="File was not written")
+
+    def iter_prompts(self, articles: Iterable[Dict]) -> Iterator[Tuple[str, Dict]]:
+        """
+        Lazily build prompts, one article at a time.
+
+        Args:
+            articles: Iterable of article metadata dictionaries
+
+        Yields:
+            Tuples (prompt, article)
+        """
+        for article in articles:
+            yield self.build_prompt(article), article
+
     async def generate_all_articles(
         self,
         batch_size: int = 100,
         overwrite: bool = False,
-        test_mode: bool = False
+        test_mode: bool = False,
+        incremental: bool = False,
+        resume: bool = False,
+        time_budget: Optional[float] = None,
+        batch_api: bool = False
     ):
         """
         Generate all articles from Excel file.
 
+        Rows are read, turned into prompts, dispatched, validated and written
+        as a lazy pipeline: each article is saved as soon as its response
+        arrives, so an interrupted run keeps everything finished so far.
+        Pending rows are dispatched in Priority order, so priority-1 pages
+        are written first and lower priorities backfill free request slots.
+        Ordering looks at most `priority_lookahead` rows ahead of the request
+        window; without a Priority column rows go out in sheet order.
+
         Args:
-            batch_size: Number of concurrent API requests
+            batch_size: Number of concurrent API requests (capped by concurrent_limit)
             overwrite: Whether to overwrite existing files
-            test_mode: If True, only process first 3 articles
+            test_mode: If True, only process first 2 articles
+            incremental: If True, regenerate only new rows and rows whose hash changed
+            resume: If True, continue the run recorded in the checkpoint journal
+            time_budget: Seconds after which only the top priority is still dispatched
+            batch_api: If True, submit all prompts through the provider's Batch API
         """
         print("\n" + "=" * 60)
         print("🚀 STARTING ARTICLE GENERATION")
         print("=" * 60 + "\n")
 
-        # Get all articles
-        articles = self.excel_parser.get_articles()
-
-        if test_mode:
-            articles = articles[:2]
-            print(f"🧪 TEST MODE: Processing only {len(articles)} articles\n")
-
-        print(f"📝 Total articles to generate: {len(articles)}\n")
-
-        # Build prompts for all articles
-        print("🔨 Building prompts...")
-        prompts = []
-        for article in articles:
-            prompt = self.build_prompt(article)
-            prompts.append((prompt, article))
+        if resume:
+            self.resumed = self.journal.load()
+            print(f"⏯️  RESUME MODE: {len(self.resumed)} articles found in journal\n")
+        self.journal.start(resume=resume)
 
-        print(f"✅ Built {len(prompts)} prompts\n")
-
-        # Generate articles via API
-        print("🤖 Generating articles via GPT-4o API...")
-        print(f"   Batch size: {batch_size}")
-        print(f"   Concurrent limit: {self.config['concurrent_limit']}\n")
-
-        results = await self.api_client.generate_articles_batch(
-            prompts,
-            batch_size=batch_size
+        # Existing outputs are skipped here, before any API call is paid for
+        articles = self.iter_pending(
+            self.excel_parser.iter_articles(),
+            overwrite=overwrite,
+            incremental=incremental
         )
+        if incremental:
+            print("♻️  INCREMENTAL MODE: Only new or changed rows will be generated\n")
+
+        # Pending rows are popped highest priority first as request slots free, read
+        # lazily at most `priority_lookahead` rows ahead (without priorities, no lookahead)
+        lookahead = self.config.get('priority_lookahead', 5000) if self.excel_parser.has_priority() else 1
+        scheduler = PriorityScheduler(time_budget=time_budget, lookahead=lookahead)
+        scheduler.feed(articles)
+        scheduler.fill()
+        articles = scheduler
+        # Known whenever the pending rows fit in the lookahead; sizes the request window
+        total = len(scheduler) if scheduler.exhausted else None
+        if time_budget is not None:
+            print(f"⏳ TIME BUDGET: Lower priorities stop being dispatched after {time_budget:g}s\n")
 
-        print("\n💾 Saving generated articles...")
-
-        # Save articles
-        saved_count = 0
-        failed_count = 0
-
-        for article_info, content in results:
-            if content:
-                success = self.file_writer.save_article(
-                    content,
-                    article_info,
-                    overwrite=overwrite
-                )
-                if success:
-                    saved_count += 1
+        if test_mode:
+            articles = itertools.islice(articles, 2)
+            total = 2 if total is None else min(total, 2)
+            print("🧪 TEST MODE: Processing only the first 2 articles by priority\n")
+
+        # Generate articles via API and save each one as it completes
+        if batch_api:
+            self.batch_client = BatchClient(self.api_client, self.config)
+            print("📦 Generating articles via the Batch API (results arrive when the batch completes)...\n")
+        else:
+            print("🤖 Generating articles via GPT-4o API...")
+            window = self.api_client.get_window_size(batch_size)
+            print(f"   Requests in flight: {window if total is None else max(1, min(window, total))}")
+            print(f"   Concurrent limit: {self.api_client.concurrent_limit}\n")
+
+        # Metrics are exported periodically during the run and once at the end
+        metrics_config = self.config.get('metrics', {})
+        metrics_paths = (
+            metrics_config.get('json_path', 'tools/articles/logs/metrics.json'),
+            metrics_config.get('prometheus_path', 'tools/articles/logs/metrics.prom')
+        )
+        exporter = None
+        if metrics_config.get('enabled', True):
+            exporter = asyncio.create_task(self.metrics.export_periodically(
+                metrics_config.get('interval_seconds', 30),
+                *metrics_paths
+            ))
+
+        on_dispatch = lambda info: self.journal.record(RunJournal.REQUESTED, info)
+        try:
+            if batch_api:
+                async for article_info, content in self.batch_client.run(
+                    self.iter_prompts(articles),
+                    on_dispatch=on_dispatch
+                ):
+                    self.record_completion(article_info, content)
+                    self.save_result(article_info, content, overwrite or incremental)
             else:
-                self.file_writer.save_failed_article(
-                    article_info,
-                    "API generation failed"
-                )
-                failed_count += 1
+                async for _, article_info, content in self.api_client.stream_articles(
+                    self.iter_prompts(articles),
+                    batch_size=batch_size,
+                    total=total,
+                    on_dispatch=on_dispatch,
+                    on_complete=self.record_completion
+                ):
+                    # Rows that reach this point were already cleared by the pre-flight check
+                    self.save_result(article_info, content, overwrite or incremental)
+        finally:
+            self.manifest.save()
+            self.journal.close()
+            if exporter:
+                exporter.cancel()
+                self.metrics.export(*metrics_paths)
 
         # Print statistics
         print("\n" + "=" * 60)
         print("📊 GENERATION COMPLETE")
         print("=" * 60)
 
-        self.api_client.print_stats()
+        if batch_api:
+            self.batch_client.print_stats()
+        else:
+            self.api_client.print_stats()
         self.file_writer.print_stats()
         self.links_manager.print_stats()
+        scheduler.print_deferred()
+        if self.excel_parser.streaming:
+            # Gathered while the rows were read, so only known now
+            self.print_input_report()
 
         # Summary
         print("\n" + "=" * 60)
         print("📋 SUMMARY")
         print("=" * 60)
-        print(f"Total Articles:       {len(articles)}")
-        print(f"Successfully Saved:   {saved_count} ✅")
-        print(f"Failed:               {failed_count} ❌")
-        print(f"Success Rate:         {round(saved_count / len(articles) * 100, 2)}%")
+        print(f"Total Articles:       {self.counts['total']}")
+        print(f"Skipped (pre-flight): {self.file_writer.stats['skipped']} ⏭️")
+        if scheduler.deferred:
+            print(f"Deferred (budget):    {sum(scheduler.deferred.values())} ⏳")
+        if resume:
+            print(f"Recovered (journal):  {self.counts['recovered']} ♻️")
+        print(f"Successfully Saved:   {self.counts['saved']} ✅")
+        print(f"Failed:               {self.counts['failed']} ❌")
+        if self.counts['total'] > 0:
+            print(f"Success Rate:         {round(self.counts['saved'] / self.counts['total'] * 100, 2)}%")
         print("=" * 60 + "\n")
 
-        if failed_count > 0:
+        if exporter:
+            print(f"📈 Metrics exported to: {metrics_paths[0]} and {metrics_paths[1]}\n")
+
+        if self.counts['failed'] > 0:
             print(f"ℹ️  Failed articles logged to: tools/articles/logs/failed_articles.log\n")
 
 
@@ -268,12 +548,42 @@ def main():
         '--batch-size',
         type=int,
         default=100,
-        help='Number of concurrent API requests (default: 100)'
+        help='Number of concurrent API requests, capped by concurrent_limit (default: 100)'
     )
     parser.add_argument(
         '--overwrite',
         action='store_true',
-        help='Overwrite existing MDX files'
+        help='Overwrite existing MDX files with newly generated content (the response cache is not read)'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only generate new rows and rows whose content or model settings changed'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume the previous run from its checkpoint journal'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Disable the on-disk response cache for this run'
+    )
+    parser.add_argument(
+        '--cache-only',
+        action='store_true',
+        help='Replay responses from the cache only; never call the API'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        help='Seconds after which only the top priority is still dispatched (default: no limit)'
+    )
+    parser.add_argument(
+        '--batch-api',
+        action='store_true',
+        help="Submit all prompts as one discounted Batch API job and wait for the results"
     )
     parser.add_argument(
         '--test',
@@ -306,21 +616,39 @@ def main():
     if not generator.load_config():
         sys.exit(1)
 
+    if args.cache_only and args.no_cache:
+        print("❌ Error: --cache-only and --no-cache cannot be combined\n")
+        sys.exit(1)
+    if args.no_cache:
+        generator.config.setdefault('response_cache', {})['enabled'] = False
+    if args.cache_only:
+        generator.config['cache_only'] = True
+        print("♻️  CACHE-ONLY MODE: Replaying cached responses, no API calls\n")
+    elif args.overwrite:
+        # Regenerating means new responses; they still replace the cached ones
+        generator.config.setdefault('response_cache', {})['refresh'] = True
+
     if not generator.load_prompt_template():
         sys.exit(1)
 
     if not generator.initialize_modules():
         sys.exit(1)
+    print(f"⏱️  Startup finished in {time.perf_counter() - STARTED:.2f}s\n")
 
     # Generate articles
     try:
         asyncio.run(generator.generate_all_articles(
             batch_size=args.batch_size,
             overwrite=args.overwrite,
-            test_mode=args.test
+            test_mode=args.test,
+            incremental=args.incremental,
+            resume=args.resume,
+            time_budget=args.time_budget,
+            batch_api=args.batch_api
         ))
     except KeyboardInterrupt:
-        print("\n\n⚠️  Generation interrupted by user")
+        print("\n\n⚠️  Generation interrupted by user (completed articles are already saved)")
+        print("   Run again with --resume to continue where this run stopped")
         sys.exit(1)
     except Exception as e:
         print(f"\n\n❌ Error during generation: {str(e)}")
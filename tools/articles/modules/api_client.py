@@ -4,18 +4,73 @@ Handles asynchronous API calls to GPT-4o with retry logic and error handling.
 """
 import asyncio
 import aiohttp
+import collections
+import itertools
 import json
-from typing import Dict, Optional
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Tuple
 import time
 
+from completion_lengths import CompletionLengthTracker
+from endpoint_pool import Endpoint, EndpointPool
+from retry_policy import DEADLINE, FATAL, RATE_LIMITED, REJECTED, RETRYABLE, CircuitBreaker, RetryPolicy
+from metrics import MetricsRegistry
+from response_cache import ResponseCache
+from token_budget import estimate_tokens
+
+
+class MalformedOutputError(Exception):
+    """Raised when a streamed response is clearly not valid MDX and is aborted early."""
+
+    def __init__(self, message: str, partial_content: str = ''):
+        super().__init__(message)
+        self.partial_content = partial_content
+
+
+# Follow-up instruction sent after an output that hit max_tokens
+CONTINUATION_PROMPT = (
+    "Your previous reply was cut off. Continue the article exactly where it stopped. "
+    "Do not repeat any text you already wrote and do not start over."
+)
+
+
+def stitch_continuation(
+    partial: str,
+    continuation: str,
+    max_overlap: int = 200,
+    min_overlap: int = 20
+) -> str:
+    """
+    Append a continuation to a truncated output.
+
+    Models sometimes repeat the last few words before continuing; the longest
+    overlap between the end of the partial output and the start of the
+    continuation is dropped. Shorter overlaps are kept: a match of a few
+    characters ('bos' + 's fight', '1' + '1 gold', a newline) is usually
+    just the text going on, and dropping it would corrupt the article.
+
+    Args:
+        partial: Output so far
+        continuation: Text returned by the continuation request
+        max_overlap: Longest overlap (in characters) to look for
+        min_overlap: Shortest overlap (in characters) treated as a repeat
+
+    Returns:
+        Combined output
+    """
+    for size in range(min(max_overlap, len(partial), len(continuation)), min_overlap - 1, -1):
+        if partial.endswith(continuation[:size]):
+            return partial + continuation[size:]
+    return partial + continuation
+
 
 class APIClient:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, metrics: Optional[MetricsRegistry] = None):
         """
         Initialize the API client.
 
         Args:
             config: Configuration dictionary with API settings
+            metrics: Shared metrics registry (a private one is created if omitted)
         """
         self.api_key = config['api_key']
         self.base_url = config['api_base_url']
@@ -25,16 +80,98 @@ class APIClient:
         self.retry_attempts = config.get('retry_attempts', 3)
         self.retry_delay = config.get('retry_delay', 2)
 
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Error classification, jittered backoff, per-article deadline and circuit breaker
+        retry_config = config.get('retry', {})
+        self.retry_policy = RetryPolicy(self.retry_attempts, self.retry_delay, retry_config)
+        self.circuit_breaker = CircuitBreaker(retry_config.get('circuit_breaker', {}))
+
+        # One or more endpoints/keys, each with its own AIMD rate controller and
+        # optional tokens-per-minute budget; the window spans all of them
+        self.endpoint_pool = EndpointPool(config)
+        self.concurrent_limit = self.endpoint_pool.total_concurrency
+
+        # Transport: connection pool, keep-alive, DNS cache, timeouts and pre-warming
+        self.transport = config.get('transport', {})
+        self.timeout = aiohttp.ClientTimeout(
+            total=self.transport.get('total_timeout', 300) or None,
+            connect=self.transport.get('connect_timeout', 10) or None,
+            sock_read=self.transport.get('read_timeout', 120) or None
+        )
+        # Pre-warm of the current run, started by the first request that needs the network
+        self.prewarm_target = 0
+        self.prewarm_task = None
+
+        self.system_message = "You are a professional SEO content writer specializing in gaming articles."
+
+        # Outputs cut off at max_tokens are continued instead of regenerated
+        self.max_continuations = config.get('max_continuations', 2)
+
+        # Extra candidates per article: 'parallel' asks for n in one request (the prompt is
+        # billed once), 'fallback' sends another request only when validation fails
+        candidate_config = config.get('candidates', {})
+        self.candidates = max(1, candidate_config.get('count', 1))
+        self.candidate_mode = candidate_config.get('mode', 'parallel')
+        self.validator = None
+        self.candidate_usage = collections.Counter()
+
+        # Per-category completion length history, used to suggest (or apply) a smaller max_tokens
+        tuning_config = config.get('max_tokens_tuning', {})
+        self.completion_lengths = None
+        if tuning_config.get('enabled', True):
+            self.completion_lengths = CompletionLengthTracker(self.max_tokens, tuning_config)
+            self.completion_lengths.load()
+
+        # Server-sent events mode: incremental parsing, TTFT metrics and early abort
+        self.stream = config.get('stream', False)
+
+        # Optional on-disk response cache; cache_only replays it without any API calls
+        cache_config = config.get('response_cache', {})
+        self.cache_only = config.get('cache_only', False)
+        # refresh (set by --overwrite) skips cache reads but still stores the new responses
+        self.cache_refresh = cache_config.get('refresh', False) and not self.cache_only
+        self.response_cache = None
+        if cache_config.get('enabled', False) or self.cache_only:
+            self.response_cache = ResponseCache(
+                cache_config.get('path', 'tools/articles/cache/responses.sqlite3'),
+                max_entries=cache_config.get('max_entries', 20000),
+                max_size_mb=cache_config.get('max_size_mb', 500),
+                max_age_days=cache_config.get('max_age_days', 30)
+            )
+
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics.add_collector(self.collect_gauges)
+
+        # End-to-end latency of every article (including retries), for percentiles
+        self.article_latencies = []
+
+        # Optional request hedging against tail latency, timed from recent request latencies
+        self.hedging = config.get('hedging', {})
+        self.request_latencies = collections.deque(maxlen=self.hedging.get('sample_window', 500))
+
+        # Streaming metrics: time to first token and generation speed per response
+        self.ttft_samples = []
+        self.tokens_per_second_samples = []
 
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
             'total_tokens': 0,
+            'retries': 0,
+            'early_aborts': 0,
+            'fatal_errors': 0,
+            'deadline_exceeded': 0,
+            'hedges_fired': 0,
+            'hedges_won': 0,
+            'prompt_tokens': 0,
+            'cached_tokens': 0,
+            'prefix_cache_hits': 0,
+            'continuations': 0,
+            'continued_articles': 0,
+            'truncated_articles': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'connections_prewarmed': 0,
             'start_time': None,
             'end_time': None
         }
@@ -56,128 +193,1087 @@ class APIClient:
         Returns:
             Generated article content or None if failed
         """
+        # The effective (possibly tuned) limit is part of the request, so of its cache key
+        max_tokens = self.max_tokens_for(article_info['url_path'])
+
+        cache_key = None
+        if self.response_cache:
+            cache_key = self.get_cache_key(prompt, max_tokens)
+            cached = None if self.cache_refresh else self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        if self.cache_only:
+            print(f"⏭️  Cache miss for {article_info['title']} (cache-only mode, no API call)")
+            return None
+
+        await self.ensure_prewarmed(session)
+
         self.stats['total_requests'] += 1
+        started = time.perf_counter()
 
-        for attempt in range(self.retry_attempts):
-            try:
-                async with session.post(
-                    url=self.base_url,
-                    json={
-                        "model": self.model,
-                        "max_tokens": self.max_tokens,
-                        "temperature": self.temperature,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a professional SEO content writer specializing in gaming articles."
-                            },
-                            {
-                                "role": "user",
-                                "content": prompt
-                            }
-                        ]
-                    },
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=120)
-                ) as response:
-                    if response.status == 200:
+        # Prompt estimate plus the full completion allowance, settled against usage
+        prompt_estimate = estimate_tokens(self.system_message + prompt)
+        payload = self.build_payload(prompt, stream=self.stream, max_tokens=max_tokens)
+
+        content, finish_reason, attempts = await self.send_with_retries(
+            session, payload, article_info, cache_key, started, prompt_estimate
+        )
+        if content is None:
+            self.stats['failed_requests'] += 1
+            self.record_article(started, attempts, 'failed')
+            return None
+        content, finish_reason, extra_attempts, continuations = await self.continue_truncated(
+            session, prompt, article_info, started, prompt_estimate, max_tokens, content, finish_reason
+        )
+        attempts += extra_attempts
+        replaced = continuations > 0
+
+        # Fallback candidates: another full request only when the previous output is rejected
+        if self.candidate_mode == 'fallback' and self.candidates > 1 and self.validator:
+            candidate = 0
+            while not self.validator(content) and candidate + 1 < self.candidates:
+                candidate += 1
+                print(f"🔁 {article_info['title']} failed validation, requesting candidate "
+                      f"{candidate + 1}/{self.candidates}")
+                fallback, fallback_finish, extra_attempts = await self.send_with_retries(
+                    session, payload, article_info, None, started, prompt_estimate
+                )
+                attempts += extra_attempts
+                if fallback is None:
+                    break
+                content, finish_reason, extra_attempts, _ = await self.continue_truncated(
+                    session, prompt, article_info, started, prompt_estimate, max_tokens, fallback, fallback_finish
+                )
+                attempts += extra_attempts
+                replaced = True
+            self.record_candidate(candidate if self.validator(content) else None)
+
+        # Only the final article is worth replaying
+        if replaced and cache_key and finish_reason == 'stop' and self.is_valid(content):
+            self.response_cache.put(cache_key, content, prompt_estimate + estimate_tokens(content))
+
+        self.stats['successful_requests'] += 1
+        self.record_article(started, attempts, 'success')
+        return content
+
+    async def continue_truncated(
+        self,
+        session: aiohttp.ClientSession,
+        prompt: str,
+        article_info: Dict,
+        started: float,
+        prompt_estimate: int,
+        max_tokens: int,
+        content: str,
+        finish_reason: Optional[str]
+    ) -> Tuple[str, Optional[str], int, int]:
+        """
+        Continue an output cut off at max_tokens instead of paying for it twice.
+
+        Args:
+            session: aiohttp ClientSession
+            prompt: The complete prompt for article generation
+            article_info: Dictionary with article metadata (for logging)
+            started: perf_counter() value when the article was picked up
+            prompt_estimate: Estimated prompt tokens
+            max_tokens: Completion limit of each request
+            content: Output so far
+            finish_reason: finish_reason of the request that produced it
+
+        Returns:
+            Tuple (stitched content, final finish_reason, attempts made, continuations sent)
+        """
+        attempts = 0
+        continuations = 0
+        while finish_reason == 'length' and continuations < self.max_continuations:
+            continuations += 1
+            self.stats['continuations'] += 1
+            print(f"🧵 {article_info['title']} hit max_tokens, requesting continuation "
+                  f"{continuations}/{self.max_continuations}")
+
+            payload = self.build_payload(prompt, stream=self.stream, partial=content, max_tokens=max_tokens)
+            piece, finish_reason, piece_attempts = await self.send_with_retries(
+                session, payload, article_info, None, started,
+                prompt_estimate + estimate_tokens(content), expect_front_matter=False
+            )
+            attempts += piece_attempts
+            if piece is None:
+                break
+            content = stitch_continuation(content, piece)
+
+        if continuations:
+            self.stats['continued_articles'] += 1
+        if finish_reason != 'stop' and continuations:
+            self.stats['truncated_articles'] += 1
+            print(f"⚠️  {article_info['title']} is still incomplete after {continuations} continuations")
+        elif finish_reason == 'length':
+            self.stats['truncated_articles'] += 1
+            print(f"⚠️  {article_info['title']} hit max_tokens (continuations disabled)")
+
+        return content, finish_reason, attempts, continuations
+
+    def is_valid(self, content: str) -> bool:
+        """Check an output with the validator, if one is set."""
+        return self.validator is None or self.validator(content)
+
+    def record_candidate(self, index: Optional[int]):
+        """
+        Count which candidate ended up being used.
+
+        Args:
+            index: Zero-based candidate index, or None if no candidate passed validation
+        """
+        key = index if index is not None else 'none'
+        self.candidate_usage[key] += 1
+        self.metrics.inc('candidates_used_total', {'index': str(key)})
+
+    def pick_candidate(self, choices: List[Tuple[str, Optional[str]]]) -> Tuple[str, Optional[str]]:
+        """
+        Choose one of the n candidates returned by a single request.
+
+        The first complete candidate that passes validation wins; failing
+        that, the first valid one that only needs continuing, else the first.
+
+        Args:
+            choices: Tuples (content, finish_reason) in candidate index order
+
+        Returns:
+            Tuple (content, finish_reason) of the chosen candidate
+        """
+        for index, (content, finish_reason) in enumerate(choices):
+            if finish_reason != 'length' and self.is_valid(content):
+                self.record_candidate(index)
+                return content, finish_reason
+        for index, (content, finish_reason) in enumerate(choices):
+            if self.is_valid(content):
+                self.record_candidate(index)
+                return content, finish_reason
+        self.record_candidate(None)
+        return choices[0]
+
+    def set_validator(self, validator: Callable[[str], bool]):
+        """
+        Set the check used to choose between candidates.
+
+        Args:
+            validator: Returns True if an output is acceptable (e.g., valid MDX)
+        """
+        self.validator = validator
+
+    async def send_with_retries(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict,
+        article_info: Dict,
+        cache_key: Optional[str],
+        started: float,
+        prompt_estimate: int,
+        expect_front_matter: bool = True
+    ) -> Tuple[Optional[str], Optional[str], int]:
+        """
+        Send one request, retrying retryable failures with backoff inside the article deadline.
+
+        Args:
+            session: aiohttp ClientSession
+            payload: Request JSON
+            article_info: Dictionary with article metadata (for logging)
+            cache_key: Response cache key, if caching is enabled
+            started: perf_counter() value when the article was picked up
+            prompt_estimate: Estimated prompt tokens
+            expect_front_matter: Whether a streamed output must start with YAML front matter
+
+        Returns:
+            Tuple (content or None if failed, finish_reason, attempts made)
+        """
+        # Every parallel candidate can run up to max_tokens
+        token_estimate = prompt_estimate + payload['max_tokens'] * payload.get('n', 1)
+
+        delay = None
+        attempt = 0
+        failed_endpoints = set()
+        while True:
+            if attempt > 0:
+                self.stats['retries'] += 1
+
+            content, finish_reason, error_class, failed_endpoint = await self.send_with_hedge(
+                session, payload, article_info, cache_key, started, attempt,
+                prompt_estimate, token_estimate, failed_endpoints, expect_front_matter
+            )
+            attempt += 1
+
+            if content is not None:
+                return content, finish_reason, attempt
+
+            # Retry a failed request on another endpoint when one is available
+            if failed_endpoint is not None:
+                failed_endpoints.add(failed_endpoint)
+
+            self.metrics.inc('retry_decisions_total', {'class': error_class})
+
+            if error_class == FATAL:
+                self.stats['fatal_errors'] += 1
+                print(f"🛑 Not retrying {article_info['title']}: error is not retryable")
+                break
+            if error_class == DEADLINE:
+                # Already reported by send_attempt
+                break
+            if attempt >= self.retry_policy.max_attempts:
+                break
+
+            # Rate limits are already held back by the controller's shared pause,
+            # and an early-aborted output is resent straight away
+            wait = 0.0
+            if error_class == RETRYABLE:
+                delay = self.retry_policy.next_delay(delay)
+                wait = delay
+
+            # No point in backing off only to skip the attempt at the deadline
+            remaining = self.retry_policy.remaining(started)
+            if remaining is not None and remaining - wait < self.retry_policy.min_attempt_seconds:
+                self.give_up_at_deadline(article_info)
+                break
+
+            # Back off outside the slot so other requests can use it
+            if wait:
+                await asyncio.sleep(wait)
+
+        return None, None, attempt
+
+    def set_static_instructions(self, instructions: str):
+        """
+        Append the static part of the prompt template to the system message.
+
+        The system message is identical for every article, so the provider
+        can serve this prefix from its prompt cache.
+
+        Args:
+            instructions: Template instructions without per-article variables
+        """
+        self.system_message = f"{self.system_message}\n\n{instructions}"
+
+    def max_tokens_for(self, url_path: str) -> int:
+        """
+        Get the max_tokens to request for an article.
+
+        Args:
+            url_path: URL path of the article
+
+        Returns:
+            The tuned per-category value when auto-apply is on, else the configured max_tokens
+        """
+        if self.completion_lengths:
+            return self.completion_lengths.max_tokens_for(url_path)
+        return self.max_tokens
+
+    def get_cache_key(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Get the response cache key of a prompt under the current model settings.
+
+        Args:
+            prompt: The complete prompt for article generation
+            max_tokens: max_tokens the request is sent with (defaults to the configured value)
+
+        Returns:
+            Cache key
+        """
+        return ResponseCache.make_key(
+            self.model,
+            self.temperature,
+            max_tokens or self.max_tokens,
+            self.system_message,
+            prompt
+        )
+
+    def build_payload(
+        self,
+        prompt: str,
+        stream: bool = False,
+        partial: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> Dict:
+        """
+        Build the chat completions request body for a prompt.
+
+        Args:
+            prompt: The complete prompt for article generation
+            stream: Whether to request server-sent events
+            partial: Output cut off at max_tokens, to request its continuation
+            max_tokens: Completion limit (defaults to the configured max_tokens)
+
+        Returns:
+            Request JSON
+        """
+        payload = {
+            "model": self.model,
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.system_message
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if self.candidates > 1 and self.candidate_mode == 'parallel' and partial is None:
+            payload["n"] = self.candidates
+        if partial is not None:
+            payload["messages"] += [
+                {"role": "assistant", "content": partial},
+                {"role": "user", "content": CONTINUATION_PROMPT}
+            ]
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    async def send_with_hedge(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict,
+        article_info: Dict,
+        cache_key: Optional[str],
+        started: float,
+        attempt: int,
+        prompt_estimate: int,
+        token_estimate: int,
+        failed_endpoints: Set[Endpoint],
+        expect_front_matter: bool = True
+    ) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[Endpoint]]:
+        """
+        Send one attempt, firing a duplicate if it runs past the hedge threshold.
+
+        The hedge timer starts once the primary request is actually sent, so
+        requests still waiting for a slot are never hedged. Whichever copy
+        succeeds first wins and the other one is cancelled.
+
+        Args:
+            session: aiohttp ClientSession
+            payload: Request JSON
+            article_info: Dictionary with article metadata (for logging)
+            cache_key: Response cache key, if caching is enabled
+            started: perf_counter() value when the article was picked up
+            attempt: Zero-based attempt number
+            prompt_estimate: Estimated prompt tokens
+            token_estimate: Estimated prompt plus completion tokens
+            failed_endpoints: Endpoints that already failed this article
+            expect_front_matter: Whether a streamed output must start with YAML front matter
+
+        Returns:
+            Tuple (content or None, finish_reason, error class or None, endpoint to avoid on retry or None)
+        """
+        def send(progress: Dict):
+            return self.send_attempt(
+                session, payload, article_info, cache_key, started, attempt,
+                prompt_estimate, token_estimate, failed_endpoints, progress, expect_front_matter
+            )
+
+        threshold = self.get_hedge_threshold()
+        if threshold is None:
+            return await send({})
+
+        primary_progress = {}
+        primary = asyncio.create_task(send(primary_progress))
+        tasks = {primary}
+        try:
+            # Wait until the primary has been in flight for `threshold` seconds
+            while True:
+                sent_at = primary_progress.get('sent_at')
+                wait = threshold if sent_at is None else sent_at + threshold - time.perf_counter()
+                if wait <= 0:
+                    break
+                done, _ = await asyncio.wait(tasks, timeout=wait)
+                if done:
+                    return primary.result()
+
+            hedge_cap = self.hedging.get('max_hedge_rate', 0.05) * self.stats['total_requests']
+            if self.stats['hedges_fired'] >= max(1, hedge_cap):
+                return await primary
+
+            self.stats['hedges_fired'] += 1
+            self.metrics.inc('hedges_total', {'outcome': 'fired'})
+            print(f"🪞 Hedging {article_info['title']} after {threshold:.1f}s")
+            hedge = asyncio.create_task(send({}))
+            tasks.add(hedge)
+
+            # Keep whichever copy succeeds first; fall back to the last failure
+            result = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if result[0] is not None:
+                        if task is hedge:
+                            self.stats['hedges_won'] += 1
+                            self.metrics.inc('hedges_total', {'outcome': 'won'})
+                        return result
+            return result
+        finally:
+            # Cancel the loser (or both, if this article itself was cancelled)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def send_attempt(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict,
+        article_info: Dict,
+        cache_key: Optional[str],
+        started: float,
+        attempt: int,
+        prompt_estimate: int,
+        token_estimate: int,
+        failed_endpoints: Set[Endpoint],
+        progress: Dict,
+        expect_front_matter: bool = True
+    ) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[Endpoint]]:
+        """
+        Send one request and classify its outcome.
+
+        Args:
+            session: aiohttp ClientSession
+            payload: Request JSON
+            article_info: Dictionary with article metadata (for logging)
+            cache_key: Response cache key, if caching is enabled
+            started: perf_counter() value when the article was picked up
+            attempt: Zero-based attempt number
+            prompt_estimate: Estimated prompt tokens
+            token_estimate: Estimated prompt plus completion tokens
+            failed_endpoints: Endpoints to avoid if another one is available
+            progress: Receives 'sent_at' once the request leaves the queue
+            expect_front_matter: Whether a streamed output must start with YAML front matter
+
+        Returns:
+            Tuple (content or None, finish_reason, error class or None, endpoint to avoid on retry or None)
+        """
+        used_tokens = 0
+        error_class = None
+
+        queued_at = time.perf_counter()
+        # Every request waits while the circuit breaker is open; the half-open probe gets a token
+        probe = await self.circuit_breaker.before_request()
+
+        # The deadline clock runs while the request is queued: an attempt with too
+        # little time left is not sent, so it is neither billed nor reserved
+        min_attempt = self.retry_policy.min_attempt_seconds
+        remaining = self.retry_policy.remaining(started)
+        if remaining is not None and remaining < min_attempt:
+            self.circuit_breaker.record(None, probe)
+            self.give_up_at_deadline(article_info)
+            return None, None, DEADLINE, None
+
+        # Least-loaded healthy endpoint; its token budget is reserved before the slot
+        # is taken, and its AIMD controller handles pauses and pacing
+        try:
+            endpoint = await asyncio.wait_for(
+                self.endpoint_pool.acquire(exclude=failed_endpoints, tokens=token_estimate),
+                timeout=None if remaining is None else remaining - min_attempt
+            )
+        except asyncio.TimeoutError:
+            self.circuit_breaker.record(None, probe)
+            self.give_up_at_deadline(article_info)
+            return None, None, DEADLINE, None
+        except BaseException:
+            # A probe cancelled before it was sent must not leave the breaker waiting on it
+            self.circuit_breaker.record(None, probe)
+            raise
+        healthy = None
+        latency = None
+        reserved = endpoint.token_budget is not None
+        try:
+            self.metrics.observe('queue_wait_seconds', time.perf_counter() - queued_at)
+
+            # Never let one attempt run past the article's deadline
+            timeout = self.timeout
+            remaining = self.retry_policy.remaining(started)
+            if remaining is not None and self.timeout.total and remaining < self.timeout.total:
+                timeout = aiohttp.ClientTimeout(
+                    total=max(min_attempt, remaining),
+                    connect=self.timeout.connect,
+                    sock_read=self.timeout.sock_read
+                )
+
+            # Filled in by the session's trace hooks (connection timing)
+            timing = {}
+            request_started = time.perf_counter()
+            progress['sent_at'] = request_started
+            async with session.post(
+                url=endpoint.base_url,
+                json=payload,
+                headers=endpoint.headers,
+                timeout=timeout,
+                trace_request_ctx=timing
+            ) as response:
+                headers_at = time.perf_counter()
+                connect_time = timing.get('connect', 0.0)
+                if 'connect' in timing:
+                    self.metrics.observe('connect_seconds', connect_time)
+                self.metrics.observe('server_seconds', headers_at - request_started - connect_time)
+                self.metrics.inc('http_responses_total', {'status': str(response.status)})
+
+                if response.status == 200:
+                    if self.stream:
+                        choices, usage = await self.read_stream(
+                            response, request_started, expect_front_matter, payload.get('n', 1)
+                        )
+                    else:
                         result = await response.json()
-                        content = result['choices'][0]['message']['content']
+                        choices = [
+                            (choice['message']['content'], choice.get('finish_reason'))
+                            for choice in sorted(result['choices'], key=lambda choice: choice.get('index', 0))
+                        ]
+                        usage = result.get('usage')
+                    content, finish_reason = self.pick_candidate(choices) if len(choices) > 1 else choices[0]
+                    self.metrics.observe('body_read_seconds', time.perf_counter() - headers_at)
 
-                        # Track token usage
-                        if 'usage' in result:
-                            self.stats['total_tokens'] += result['usage']['total_tokens']
+                    # Track token usage
+                    cached_tokens = 0
+                    if usage:
+                        used_tokens = usage['total_tokens']
+                        cached_tokens = (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+                        self.stats['total_tokens'] += used_tokens
+                        self.stats['prompt_tokens'] += usage.get('prompt_tokens', 0)
+                        self.stats['cached_tokens'] += cached_tokens
+                        self.metrics.inc('prompt_tokens_total', amount=usage.get('prompt_tokens', 0))
+                        self.metrics.inc('cached_prompt_tokens_total', amount=cached_tokens)
+                        self.metrics.inc('completion_tokens_total', amount=usage.get('completion_tokens', 0))
+                    else:
+                        used_tokens = token_estimate
 
-                        self.stats['successful_requests'] += 1
-                        return content
+                    # Whole-article lengths only; continuations would skew the distribution
+                    if self.completion_lengths and expect_front_matter:
+                        self.completion_lengths.record(
+                            article_info['url_path'],
+                            usage['completion_tokens'] if usage and len(choices) == 1 else estimate_tokens(content),
+                            truncated=finish_reason == 'length'
+                        )
 
-                    elif response.status == 429:  # Rate limit
-                        wait_time = self.retry_delay * (attempt + 1) * 2
-                        print(f"⚠️  Rate limited for {article_info['title']}, waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
+                    # Truncated or rejected outputs are cached once continued or replaced
+                    if cache_key and finish_reason != 'length' and self.is_valid(content):
+                        self.response_cache.put(cache_key, content, used_tokens)
 
+                    healthy = True
+                    latency = time.perf_counter() - request_started
+                    self.request_latencies.append(latency)
+                    if cached_tokens:
+                        self.stats['prefix_cache_hits'] += 1
+                        self.metrics.observe('prefix_cached_request_seconds', latency)
                     else:
-                        error_text = await response.text()
-                        print(f"❌ API error {response.status} for {article_info['title']}: {error_text}")
-
-                        if attempt < self.retry_attempts - 1:
-                            await asyncio.sleep(self.retry_delay * (attempt + 1))
-                            continue
-                        else:
-                            self.stats['failed_requests'] += 1
-                            return None
-
-            except asyncio.TimeoutError:
-                print(f"⏱️  Timeout for {article_info['title']} (attempt {attempt + 1}/{self.retry_attempts})")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                else:
-                    self.stats['failed_requests'] += 1
-                    return None
+                        self.metrics.observe('uncached_request_seconds', latency)
+                    endpoint.rate_controller.on_success(response.headers)
+                    if endpoint.token_budget:
+                        endpoint.token_budget.sync_remaining(response.headers.get('x-ratelimit-remaining-tokens'))
+                    return content, finish_reason, None, None
 
-            except Exception as e:
-                print(f"❌ Exception for {article_info['title']}: {str(e)}")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
+                error_text = await response.text()
+                error_class = self.retry_policy.classify_status(response.status, error_text)
+
+                if error_class == RATE_LIMITED:
+                    endpoint.rate_controller.on_rate_limited(response.headers)
+                    if endpoint.token_budget:
+                        endpoint.token_budget.sync_remaining(response.headers.get('x-ratelimit-remaining-tokens'))
+                    print(f"⚠️  Rate limited for {article_info['title']} on {endpoint.name}, "
+                          f"backing off (concurrency limit {endpoint.rate_controller.concurrency_limit:.1f})")
                 else:
-                    self.stats['failed_requests'] += 1
-                    return None
+                    healthy = False if error_class == RETRYABLE else None
+                    print(f"❌ API error {response.status} for {article_info['title']}: {error_text}")
 
-        self.stats['failed_requests'] += 1
-        return None
+        except MalformedOutputError as e:
+            # The provider answered, it just produced the wrong thing
+            error_class = REJECTED
+            healthy = True
+            self.stats['early_aborts'] += 1
+            self.metrics.inc('request_errors_total', {'kind': 'early_abort'})
+            print(f"✂️  Aborted {article_info['title']} early: {str(e)} "
+                  f"(attempt {attempt + 1}/{self.retry_policy.max_attempts})")
+            # Only the prompt and the few streamed tokens were paid for
+            used_tokens = prompt_estimate + estimate_tokens(e.partial_content)
 
-    async def generate_articles_batch(
+        except asyncio.TimeoutError:
+            error_class = RETRYABLE
+            healthy = False
+            self.metrics.inc('request_errors_total', {'kind': 'timeout'})
+            print(f"⏱️  Timeout for {article_info['title']} "
+                  f"(attempt {attempt + 1}/{self.retry_policy.max_attempts})")
+            # The provider may still bill a timed-out generation
+            used_tokens = token_estimate
+
+        except asyncio.CancelledError:
+            # A hedge loser: a closed stream stops generation, a buffered request may still be billed
+            if 'sent_at' in progress:
+                used_tokens = prompt_estimate if self.stream else token_estimate
+            raise
+
+        except Exception as e:
+            error_class = self.retry_policy.classify_exception(e)
+            healthy = False if error_class == RETRYABLE else None
+            self.metrics.inc('request_errors_total', {'kind': type(e).__name__})
+            print(f"❌ Exception for {article_info['title']}: {str(e) or type(e).__name__}")
+
+        finally:
+            # One failing endpoint says nothing about the provider while another is
+            # still in rotation: the pool routes around it instead of pausing everything
+            outcome = healthy
+            if healthy is False and self.endpoint_pool.has_alternative(endpoint):
+                outcome = None
+            self.circuit_breaker.record(outcome, probe)
+            self.endpoint_pool.record(endpoint, healthy, latency)
+            self.endpoint_pool.release(endpoint)
+            if reserved:
+                endpoint.token_budget.settle(token_estimate, used_tokens)
+
+        return None, None, error_class, endpoint if healthy is False else None
+
+    def give_up_at_deadline(self, article_info: Dict):
+        """
+        Count and report an article abandoned at its deadline.
+
+        Args:
+            article_info: Dictionary with article metadata (for logging)
+        """
+        self.stats['deadline_exceeded'] += 1
+        print(f"⌛ Giving up on {article_info['title']}: "
+              f"deadline of {self.retry_policy.deadline}s reached")
+
+    def get_hedge_threshold(self) -> Optional[float]:
+        """
+        Current hedge delay: the configured percentile of recent request
+        latencies, floored at min_delay.
+
+        Returns:
+            Seconds after which a duplicate is fired, or None if hedging is
+            disabled or there are too few samples yet
+        """
+        if not self.hedging.get('enabled', False) or self.cache_only:
+            return None
+        if len(self.request_latencies) < self.hedging.get('min_samples', 20):
+            return None
+
+        samples = sorted(self.request_latencies)
+        index = min(len(samples) - 1, int(len(samples) * self.hedging.get('percentile', 95) / 100))
+        return max(self.hedging.get('min_delay', 1.0), samples[index])
+
+    def record_article(self, started: float, attempts: int, outcome: str):
+        """
+        Record end-to-end latency and the attempt count of one article.
+
+        Args:
+            started: perf_counter() value when the article was picked up
+            attempts: Number of attempts used
+            outcome: 'success' or 'failed'
+        """
+        elapsed = time.perf_counter() - started
+        self.article_latencies.append(elapsed)
+        self.metrics.observe('article_latency_seconds', elapsed)
+        self.metrics.inc('article_attempts_total', {'attempts': str(attempts), 'outcome': outcome})
+
+    def build_trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build aiohttp trace hooks that time new connections per request and
+        count how often pooled connections are reused.
+
+        Returns:
+            TraceConfig to pass to ClientSession
+        """
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_start(session, context, params):
+            context.connect_started = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            self.stats['connections_created'] += 1
+            if isinstance(context.trace_request_ctx, dict):
+                context.trace_request_ctx['connect'] = time.perf_counter() - context.connect_started
+
+        async def on_connection_reuseconn(session, context, params):
+            self.stats['connections_reused'] += 1
+
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def create_session(self, window: int) -> aiohttp.ClientSession:
+        """
+        Create the shared session with a connection pool sized to the window.
+
+        Args:
+            window: Number of requests kept in flight
+
+        Returns:
+            ClientSession using the configured transport settings
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.transport.get('pool_size') or window,
+            limit_per_host=self.transport.get('limit_per_host', 0),
+            keepalive_timeout=self.transport.get('keepalive_timeout', 60),
+            ttl_dns_cache=self.transport.get('dns_cache_ttl', 300)
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            trace_configs=[self.build_trace_config()]
+        )
+
+    async def ensure_prewarmed(self, session: aiohttp.ClientSession):
+        """
+        Pre-warm the pool once, when the first request of a run needs the network.
+
+        Runs where every article is skipped or served from the cache open no
+        connections at all. Requests arriving during the warm-up wait for it.
+
+        Args:
+            session: Session whose pool should be warmed
+        """
+        if not self.prewarm_target:
+            return
+        if self.prewarm_task is None:
+            self.prewarm_task = asyncio.ensure_future(self.prewarm(session, self.prewarm_target))
+        # Shielded so a cancelled hedge or worker does not abort the shared warm-up
+        await asyncio.shield(self.prewarm_task)
+
+    async def prewarm(self, session: aiohttp.ClientSession, connections: int):
+        """
+        Open pooled connections before the first dispatch, so the first
+        window of requests does not pay DNS and TLS setup all at once.
+
+        Each warm-up is a cheap GET (the /models endpoint next to the chat
+        completions URL by default); failures only cost a cold start.
+        Connections are split across endpoints by their concurrency limits.
+
+        Args:
+            session: Session whose pool should be warmed
+            connections: Number of connections to open
+        """
+        created_before = self.stats['connections_created']
+        started = time.perf_counter()
+
+        async def warm(endpoint):
+            url = (
+                self.transport.get('prewarm_url') or
+                endpoint.base_url.rsplit('/chat/completions', 1)[0] + '/models'
+            )
+            async with session.get(url, headers=endpoint.headers) as response:
+                await response.read()
+
+        total = self.endpoint_pool.total_concurrency
+        warmups = [
+            warm(endpoint)
+            for endpoint in self.endpoint_pool.endpoints
+            for _ in range(max(1, round(connections * endpoint.max_concurrency / total)))
+        ]
+
+        results = await asyncio.gather(*warmups, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+
+        self.stats['connections_prewarmed'] = self.stats['connections_created'] - created_before
+        print(f"🔥 Pre-warmed {self.stats['connections_prewarmed']} connections "
+              f"in {time.perf_counter() - started:.2f}s")
+        if errors:
+            print(f"⚠️  {len(errors)} warm-up requests failed: {str(errors[0]) or type(errors[0]).__name__}")
+
+    def collect_gauges(self) -> Dict[str, float]:
+        """
+        Current client state for metrics export.
+
+        Returns:
+            Dictionary of gauge values
+        """
+        gauges = {
+            'requests_total': self.stats['total_requests'],
+            'requests_successful': self.stats['successful_requests'],
+            'requests_failed': self.stats['failed_requests'],
+            'retries_total': self.stats['retries'],
+            'tokens_total': self.stats['total_tokens'],
+            'concurrency_limit': sum(e.rate_controller.concurrency_limit for e in self.endpoint_pool.endpoints),
+            'in_flight': sum(e.rate_controller.in_flight for e in self.endpoint_pool.endpoints),
+            'endpoints_healthy': sum(e.is_healthy(time.monotonic()) for e in self.endpoint_pool.endpoints),
+            'circuit_open': int(self.circuit_breaker.state != CircuitBreaker.CLOSED),
+            'circuit_trips': self.circuit_breaker.stats['trips'],
+            'hedges_fired': self.stats['hedges_fired'],
+            'hedges_won': self.stats['hedges_won'],
+            'cached_prompt_tokens': self.stats['cached_tokens'],
+            'continuations': self.stats['continuations'],
+            'connections_created': self.stats['connections_created'],
+            'connections_reused': self.stats['connections_reused']
+        }
+        if self.response_cache:
+            gauges['cache_hits'] = self.response_cache.stats['hits']
+            gauges['cache_misses'] = self.response_cache.stats['misses']
+        return gauges
+
+    async def read_stream(
         self,
-        prompts: list,
-        batch_size: int = 100
-    ) -> list:
+        response: aiohttp.ClientResponse,
+        request_started: float,
+        expect_front_matter: bool = True,
+        candidates: int = 1
+    ) -> Tuple[List[Tuple[str, Optional[str]]], Optional[Dict]]:
+        """
+        Read a server-sent events completion incrementally.
+
+        Records time to first token and tokens/second, and aborts as soon as
+        the opening characters show the article cannot start with the YAML
+        front matter ('---') that validation requires. With several
+        candidates the stream is only aborted once every one of them is bad.
+
+        Args:
+            response: Streaming aiohttp response
+            request_started: perf_counter() value when the request was sent
+            expect_front_matter: Whether to check the opening characters
+                (continuations pick up mid-article)
+            candidates: Number of candidates requested (n)
+
+        Returns:
+            Tuple of (list of (content, finish_reason) per candidate, usage or None)
+
+        Raises:
+            MalformedOutputError: If the output is clearly not valid MDX
+        """
+        parts = collections.defaultdict(list)
+        received = collections.Counter()
+        finish_reasons = {}
+        checked = set()
+        rejected = set()
+        usage = None
+        first_token_at = None
+
+        async for raw_line in response.content:
+            line = raw_line.decode('utf-8').strip()
+            if not line.startswith('data:'):
+                continue
+
+            data = line[5:].strip()
+            if data == '[DONE]':
+                break
+
+            chunk = json.loads(data)
+            if chunk.get('usage'):
+                usage = chunk['usage']
+
+            for choice in chunk.get('choices', []):
+                index = choice.get('index', 0)
+                if choice.get('finish_reason'):
+                    finish_reasons[index] = choice['finish_reason']
+                delta = choice.get('delta', {}).get('content')
+                if not delta:
+                    continue
+
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    self.ttft_samples.append(first_token_at - request_started)
+
+                parts[index].append(delta)
+                received[index] += len(delta)
+
+                if expect_front_matter and index not in checked and received[index] >= 3:
+                    checked.add(index)
+                    head = ''.join(parts[index])[:3]
+                    if head != '---':
+                        rejected.add(index)
+                        if len(rejected) >= candidates:
+                            raise MalformedOutputError(
+                                f"output starts with {head!r} instead of YAML front matter",
+                                ''.join(''.join(pieces) for pieces in parts.values())
+                            )
+
+        choices = [
+            (''.join(parts[index]), finish_reasons.get(index))
+            for index in sorted(set(parts) | set(finish_reasons))
+        ] or [('', None)]
+
+        if first_token_at is not None:
+            generation_time = time.perf_counter() - first_token_at
+            completion_tokens = (
+                usage['completion_tokens'] if usage
+                else sum(estimate_tokens(content) for content, _ in choices)
+            )
+            if generation_time > 0:
+                self.tokens_per_second_samples.append(completion_tokens / generation_time)
+
+        return choices, usage
+
+    def get_latency_percentiles(self) -> Dict:
         """
-        Generate multiple articles in batches.
+        Get end-to-end article latency percentiles.
+
+        Returns:
+            Dictionary with p50/p95/p99/max latency in seconds
+        """
+        if not self.article_latencies:
+            return {'p50': 0, 'p95': 0, 'p99': 0, 'max': 0}
+
+        ordered = sorted(self.article_latencies)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 3)
+
+        return {
+            'p50': percentile(50),
+            'p95': percentile(95),
+            'p99': percentile(99),
+            'max': round(ordered[-1], 3)
+        }
+
+    def get_streaming_stats(self) -> Dict:
+        """
+        Get time-to-first-token and generation speed statistics.
+
+        Returns:
+            Dictionary with TTFT p50/p95 (seconds) and mean tokens/second
+        """
+        ttft = sorted(self.ttft_samples)
+        speeds = self.tokens_per_second_samples
+
+        def percentile(p: float) -> float:
+            return round(ttft[min(len(ttft) - 1, int(p / 100 * len(ttft)))], 3) if ttft else 0
+
+        return {
+            'ttft_p50': percentile(50),
+            'ttft_p95': percentile(95),
+            'tokens_per_second': round(sum(speeds) / len(speeds), 1) if speeds else 0
+        }
+
+    def get_window_size(self, batch_size: Optional[int] = None) -> int:
+        """
+        Get the number of requests kept in flight at once.
 
         Args:
-            prompts: List of tuples (prompt, article_info)
-            batch_size: Number of concurrent requests
+            batch_size: Requested window size (capped by concurrent_limit)
 
         Returns:
-            List of tuples (article_info, content or None)
+            Effective window size
+        """
+        if batch_size:
+            return max(1, min(batch_size, self.concurrent_limit))
+        return max(1, self.concurrent_limit)
+
+    async def stream_articles(
+        self,
+        prompts: Iterable,
+        batch_size: Optional[int] = None,
+        total: Optional[int] = None,
+        on_dispatch: Optional[Callable[[Dict], None]] = None,
+        on_complete: Optional[Callable[[Dict, Optional[str]], None]] = None
+    ) -> AsyncIterator[Tuple[int, Dict, Optional[str]]]:
+        """
+        Generate articles using a sliding window and yield each as it completes.
+
+        Exactly `window` requests are kept in flight: as soon as one
+        finishes, the next prompt is pulled from `prompts` and dispatched,
+        so a slow request only occupies its own slot. Prompts are consumed
+        lazily and finished results pass through a queue bounded by the
+        window, so memory stays proportional to the requests in flight.
+        The first window of prompts is read up front: a shorter input sizes
+        the window (and the connection pre-warm) to the work actually there.
+
+        Args:
+            prompts: Iterable (may be a generator) of tuples (prompt, article_info)
+            batch_size: Number of concurrent requests (capped by concurrent_limit)
+            total: Expected number of prompts, only used for progress output
+            on_dispatch: Called with article_info when a slot picks up a prompt
+            on_complete: Called with (article_info, content) as soon as a
+                request finishes, before the result waits in the queue
+
+        Yields:
+            Tuples (index, article_info, content or None) in completion order
         """
         self.stats['start_time'] = time.time()
-        results = []
 
-        async with aiohttp.ClientSession() as session:
-            # Process in batches
-            for i in range(0, len(prompts), batch_size):
-                batch = prompts[i:i + batch_size]
-                batch_num = i // batch_size + 1
-                total_batches = (len(prompts) + batch_size - 1) // batch_size
+        window = self.get_window_size(batch_size)
+        if total is not None:
+            window = max(1, min(window, total))
+
+        prompts = iter(prompts)
+        head = list(itertools.islice(prompts, window))
+        if len(head) < window:
+            total = len(head)
+            window = max(1, total)
+        pending = enumerate(itertools.chain(head, prompts))
+        done = asyncio.Queue(maxsize=window)
+        finished = object()
+        completed = 0
+
+        print(f"\n📦 Dispatching articles with {window} requests in flight...")
+
+        async def worker(session: aiohttp.ClientSession):
+            try:
+                # All workers share one iterator, so each free slot pulls the next prompt
+                for index, (prompt, article_info) in pending:
+                    if on_dispatch:
+                        on_dispatch(article_info)
+                    content = await self.generate_article(session, prompt, article_info)
+                    if on_complete:
+                        on_complete(article_info, content)
+                    await done.put((index, article_info, content))
+            except Exception as e:
+                await done.put(e)
+            await done.put(finished)
 
-                print(f"\n📦 Processing batch {batch_num}/{total_batches} ({len(batch)} articles)...")
+        # Warmed lazily by the first cache miss (see ensure_prewarmed), never past the window
+        self.prewarm_task = None
+        self.prewarm_target = 0
+        if self.transport.get('prewarm', True) and not self.cache_only and head:
+            self.prewarm_target = min(window, self.transport.get('prewarm_connections') or window)
 
-                # Create tasks for this batch
-                tasks = [
-                    self.generate_article(session, prompt, article_info)
-                    for prompt, article_info in batch
-                ]
+        async with self.create_session(window) as session:
+            workers = [asyncio.create_task(worker(session)) for _ in range(window)]
+            try:
+                running = len(workers)
+                while running:
+                    item = await done.get()
+                    if item is finished:
+                        running -= 1
+                        continue
+                    if isinstance(item, Exception):
+                        raise item
 
-                # Execute batch concurrently
-                batch_results = await asyncio.gather(*tasks)
+                    completed += 1
+                    if completed % window == 0 or completed == total:
+                        print(f"✅ Completed {completed}/{total if total is not None else '?'} articles")
 
-                # Combine with article info
-                for (prompt, article_info), content in zip(batch, batch_results):
-                    results.append((article_info, content))
+                    yield item
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                if self.prewarm_task is not None and not self.prewarm_task.done():
+                    self.prewarm_task.cancel()
+                    await asyncio.gather(self.prewarm_task, return_exceptions=True)
+                self.stats['end_time'] = time.time()
+                if self.completion_lengths:
+                    self.completion_lengths.save()
 
-                # Progress update
-                completed = i + len(batch)
-                print(f"✅ Completed {completed}/{len(prompts)} articles")
+    async def generate_articles_batch(
+        self,
+        prompts: list,
+        batch_size: Optional[int] = None
+    ) -> list:
+        """
+        Generate multiple articles and collect all results.
 
-                # Small delay between batches to avoid overwhelming the API
-                if i + batch_size < len(prompts):
-                    await asyncio.sleep(1)
+        Args:
+            prompts: List of tuples (prompt, article_info)
+            batch_size: Number of concurrent requests (capped by concurrent_limit)
+
+        Returns:
+            List of tuples (article_info, content or None), in input order
+        """
+        results = [None] * len(prompts)
+
+        async for index, article_info, content in self.stream_articles(
+            prompts,
+            batch_size=batch_size,
+            total=len(prompts)
+        ):
+            results[index] = (article_info, content)
 
-        self.stats['end_time'] = time.time()
         return results
 
     def get_stats(self) -> Dict:
@@ -202,6 +1298,19 @@ class APIClient:
             if stats['total_requests'] > 0 else 0
         )
 
+        # Share of prompt tokens the provider served from its prefix cache
+        stats['cached_token_rate'] = (
+            round(stats['cached_tokens'] / stats['prompt_tokens'] * 100, 2)
+            if stats['prompt_tokens'] > 0 else 0
+        )
+
+        # Share of API requests served on an already-open connection (warm-up excluded)
+        connections = stats['connections_created'] - stats['connections_prewarmed'] + stats['connections_reused']
+        stats['connection_reuse_rate'] = (
+            round(stats['connections_reused'] / connections * 100, 2)
+            if connections > 0 else 0
+        )
+
         return stats
 
     def print_stats(self):
@@ -216,8 +1325,101 @@ class APIClient:
         print(f"Failed:               {stats['failed_requests']} ❌")
         print(f"Success Rate:         {stats['success_rate']}%")
         print(f"Total Tokens:         {stats['total_tokens']}")
+        if stats['cached_tokens']:
+            cached = self.metrics.histograms.get('prefix_cached_request_seconds')
+            uncached = self.metrics.histograms.get('uncached_request_seconds')
+            print(f"Cached Prompt Tokens: {stats['cached_tokens']} ({stats['cached_token_rate']}% of "
+                  f"{stats['prompt_tokens']}, {stats['prefix_cache_hits']} requests) 🧊")
+            if cached and uncached and cached.count and uncached.count:
+                print(f"Latency Cached/Not:   {cached.sum / cached.count:.2f}s / "
+                      f"{uncached.sum / uncached.count:.2f}s (avg)")
+        print(f"Retries:              {stats['retries']}")
+        print(f"Fatal (not retried):  {stats['fatal_errors']} 🛑")
+        print(f"Deadline Exceeded:    {stats['deadline_exceeded']} ⌛")
+        if self.candidate_usage:
+            summary = ', '.join(
+                f"#{key + 1}={value}" if key != 'none' else f"none valid={value}"
+                for key, value in sorted(self.candidate_usage.items(), key=lambda item: str(item[0]))
+            )
+            print(f"Candidate Used:       {summary} ({self.candidates} {self.candidate_mode})")
+        if stats['continuations'] or stats['truncated_articles']:
+            print(f"Continuations:        {stats['continuations']} for {stats['continued_articles']} articles 🧵 "
+                  f"({stats['truncated_articles']} still truncated)")
+        breaker_stats = self.circuit_breaker.get_stats()
+        print(f"Circuit Breaker:      {breaker_stats['trips']} trips "
+              f"({breaker_stats['open_seconds_total']}s paused, now {breaker_stats['state']})")
         print(f"Duration:             {stats['duration_seconds']}s")
         print(f"Requests/Second:      {stats['requests_per_second']}")
+        print(f"Connections:          {stats['connections_created']} opened "
+              f"({stats['connections_prewarmed']} pre-warmed), {stats['connections_reused']} reused")
+        print(f"Connection Reuse:     {stats['connection_reuse_rate']}%")
+
+        latency = self.get_latency_percentiles()
+        print(f"Latency p50/p95/p99:  {latency['p50']}s / {latency['p95']}s / {latency['p99']}s")
+
+        statuses = self.metrics.counters.get('http_responses_total', {})
+        if statuses:
+            summary = ', '.join(f"{dict(key)['status']}={value}" for key, value in sorted(statuses.items()))
+            print(f"Status Codes:         {summary}")
+
+        if self.hedging.get('enabled', False):
+            threshold = self.get_hedge_threshold()
+            print(f"Hedged Requests:      {stats['hedges_fired']} fired, {stats['hedges_won']} won 🪞 "
+                  f"(threshold {f'{threshold:.2f}s' if threshold is not None else 'warming up'})")
+
+        if self.stream:
+            streaming = self.get_streaming_stats()
+            print(f"TTFT p50/p95:         {streaming['ttft_p50']}s / {streaming['ttft_p95']}s")
+            print(f"Tokens/Second (avg):  {streaming['tokens_per_second']}")
+            print(f"Early Aborts:         {stats['early_aborts']} ✂️")
+
+        pool_stats = self.endpoint_pool.get_stats()
+        if len(pool_stats['endpoints']) > 1:
+            print(f"Endpoints:            {len(pool_stats['endpoints'])} ({pool_stats['routing']} routing, "
+                  f"{pool_stats['failovers']} failovers)")
+        print(f"Rate Limited (429):   {pool_stats['rate_limited']} ⚠️")
+
+        multiple = len(pool_stats['endpoints']) > 1
+        indent = '  ' if multiple else ''
+
+        def label(text: str) -> str:
+            # Keep values aligned with the other lines when nested under an endpoint
+            return f"{indent}{text + ':':<{22 - len(indent)}}"
+
+        for endpoint_stats in pool_stats['endpoints']:
+            rate_stats = endpoint_stats['rate_control']
+            budget_stats = endpoint_stats['token_budget']
+            if multiple:
+                print(f"\n🔀 {endpoint_stats['name']} ({'healthy' if endpoint_stats['healthy'] else 'cooling down'})")
+                print(f"{label('Requests')}{endpoint_stats['requests']} "
+                      f"({endpoint_stats['successes']} ok, {endpoint_stats['failures']} failed, "
+                      f"{rate_stats['rate_limited']} rate limited)")
+                print(f"{label('Latency (EWMA)')}{endpoint_stats['latency']}s")
+                print(f"{label('Ejections')}{endpoint_stats['ejections']}")
+            print(f"{label('Backoff Decreases')}{rate_stats['decreases']}")
+            print(f"{label('Concurrency Limit')}{rate_stats['concurrency_limit']} "
+                  f"(min {rate_stats['min_concurrency_seen']})")
+            if rate_stats['rate']:
+                print(f"{label('Paced Rate')}{rate_stats['rate']} req/s")
+
+            if budget_stats:
+                print(f"{label('TPM Budget')}{budget_stats['tokens_per_minute']}")
+                print(f"{label('Admission Waits')}{budget_stats['admission_waits']} "
+                      f"({budget_stats['admission_wait_seconds']}s)")
+                print(f"{label('Tokens Refunded')}{budget_stats['refunded_tokens']}")
+        if multiple:
+            print()
+
+        if self.response_cache:
+            cache_stats = self.response_cache.get_stats()
+            print(f"Cache Hits:           {cache_stats['hits']} ♻️")
+            print(f"Cache Misses:         {cache_stats['misses']}")
+            print(f"Cache Hit Rate:       {cache_stats['hit_rate']}%")
+            print(f"Tokens Saved:         {cache_stats['saved_tokens']}")
+            print(f"Cache Entries:        {cache_stats['entries']} (evicted {cache_stats['evicted']})")
+
+        if self.completion_lengths:
+            self.completion_lengths.print_suggestions()
         print("=" * 60 + "\n")
 
 
@@ -235,7 +1437,7 @@ if __name__ == "__main__":
         test_prompt = "Write a short test paragraph about Pixel Blade game."
         test_info = {'title': 'Test Article', 'url_path': '/test/'}
 
-        async with aiohttp.ClientSession() as session:
+        async with client.create_session(1) as session:
             result = await client.generate_article(session, test_prompt, test_info)
 
             if result:
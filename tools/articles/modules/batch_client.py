@@ -0,0 +1,387 @@
+"""
+Batch Client Module
+Runs a whole generation through the provider's Batch API (OpenAI-compatible
+/v1/files and /v1/batches endpoints): prompts are written to a JSONL batch
+file, submitted, polled with backoff and the results downloaded. Batch jobs
+are billed at a discount and do not count against live rate limits.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+from api_client import APIClient
+from token_budget import estimate_tokens
+
+
+class BatchClient:
+    # Batch states after which polling stops
+    TERMINAL_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+    def __init__(self, api_client: APIClient, config: Dict):
+        """
+        Initialize the batch client.
+
+        Args:
+            api_client: Live client whose payload format, cache and stats are reused
+            config: Configuration dictionary with API settings
+        """
+        self.api_client = api_client
+        batch_config = config.get('batch_api', {})
+
+        # Batches go to the first endpoint; its /v1 root hosts /files and /batches
+        endpoint = api_client.endpoint_pool.endpoints[0]
+        self.base_url = (
+            batch_config.get('base_url') or
+            endpoint.base_url.rsplit('/chat/completions', 1)[0]
+        )
+        self.headers = {"Authorization": endpoint.headers["Authorization"]}
+
+        self.completion_window = batch_config.get('completion_window', '24h')
+        self.max_requests = batch_config.get('max_requests_per_batch', 50000)
+        self.poll_interval = batch_config.get('poll_interval', 10)
+        self.max_poll_interval = batch_config.get('max_poll_interval', 300)
+        self.state_path = batch_config.get('state_file', 'tools/articles/cache/batch_state.json')
+
+        self.stats = {
+            'batches': 0,
+            'reattached': 0,
+            'submitted': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'cache_hits': 0,
+            'polls': 0,
+            'total_tokens': 0,
+            'cached_tokens': 0,
+            'start_time': None,
+            'end_time': None
+        }
+
+    def load_state(self) -> List[Dict]:
+        """
+        Load batches submitted by an earlier, interrupted run.
+
+        Returns:
+            List of {'id': batch_id, 'custom_ids': [...]} records
+        """
+        if not os.path.exists(self.state_path):
+            return []
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('batches', [])
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def save_state(self, batches: List[Dict]):
+        """
+        Atomically record submitted batches so a crash never pays for them twice.
+
+        Args:
+            batches: List of {'id': batch_id, 'custom_ids': [...]} records
+        """
+        if not batches:
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+            return
+
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'batches': batches}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def build_batch_file(self, requests: List[Tuple[str, str]]) -> bytes:
+        """
+        Build the JSONL input file.
+
+        Args:
+            requests: List of tuples (custom_id, prompt)
+
+        Returns:
+            JSONL file content
+        """
+        lines = [
+            json.dumps({
+                'custom_id': custom_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self.api_client.build_payload(
+                    prompt, max_tokens=self.api_client.max_tokens_for(custom_id)
+                )
+            }, ensure_ascii=False)
+            for custom_id, prompt in requests
+        ]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    async def upload(self, session: aiohttp.ClientSession, content: bytes) -> str:
+        """
+        Upload a batch input file.
+
+        Args:
+            session: aiohttp ClientSession
+            content: JSONL file content
+
+        Returns:
+            File ID
+        """
+        form = aiohttp.FormData()
+        form.add_field('purpose', 'batch')
+        form.add_field('file', content, filename='articles.jsonl', content_type='application/jsonl')
+
+        async with session.post(f"{self.base_url}/files", data=form, headers=self.headers) as response:
+            response.raise_for_status()
+            return (await response.json())['id']
+
+    async def create_batch(self, session: aiohttp.ClientSession, input_file_id: str) -> Dict:
+        """
+        Create a batch job for an uploaded input file.
+
+        Args:
+            session: aiohttp ClientSession
+            input_file_id: ID returned by upload()
+
+        Returns:
+            Batch object
+        """
+        body = {
+            'input_file_id': input_file_id,
+            'endpoint': '/v1/chat/completions',
+            'completion_window': self.completion_window
+        }
+        async with session.post(f"{self.base_url}/batches", json=body, headers=self.headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def wait_for_batch(self, session: aiohttp.ClientSession, batch_id: str) -> Dict:
+        """
+        Poll a batch until it reaches a terminal state, backing off between polls.
+
+        Args:
+            session: aiohttp ClientSession
+            batch_id: Batch ID
+
+        Returns:
+            Final batch object
+        """
+        interval = self.poll_interval
+        last_status = None
+        while True:
+            try:
+                async with session.get(f"{self.base_url}/batches/{batch_id}", headers=self.headers) as response:
+                    response.raise_for_status()
+                    batch = await response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # A failed poll says nothing about the batch; try again later
+                print(f"⚠️  Could not poll batch {batch_id}: {str(e) or type(e).__name__}")
+                batch = {'status': last_status}
+            self.stats['polls'] += 1
+
+            if batch['status'] in self.TERMINAL_STATES:
+                return batch
+
+            if batch['status'] != last_status:
+                counts = batch.get('request_counts') or {}
+                print(f"⏳ Batch {batch_id}: {batch['status']} "
+                      f"({counts.get('completed', 0)}/{counts.get('total', '?')} done)")
+                last_status = batch['status']
+
+            await asyncio.sleep(interval)
+            interval = min(self.max_poll_interval, interval * 1.5)
+
+    async def download(self, session: aiohttp.ClientSession, file_id: Optional[str]) -> List[Dict]:
+        """
+        Download and parse a batch output or error file.
+
+        Args:
+            session: aiohttp ClientSession
+            file_id: File ID (None yields no records)
+
+        Returns:
+            List of result records
+        """
+        if not file_id:
+            return []
+
+        async with session.get(f"{self.base_url}/files/{file_id}/content", headers=self.headers) as response:
+            response.raise_for_status()
+            text = await response.text()
+
+        records = []
+        for line in text.splitlines():
+            if line.strip():
+                records.append(json.loads(line))
+        return records
+
+    def parse_record(self, record: Dict) -> Tuple[Optional[str], int]:
+        """
+        Extract the article content from one result record.
+
+        Args:
+            record: Line of a batch output or error file
+
+        Returns:
+            Tuple (generated content or None if the request failed, billed tokens)
+        """
+        response = record.get('response') or {}
+        body = response.get('body') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            error = record.get('error') or body.get('error') or {}
+            print(f"❌ Batch request failed for {record.get('custom_id')}: "
+                  f"{error.get('message', response.get('status_code'))}")
+            return None, 0
+
+        try:
+            choices = [
+                (choice['message']['content'], choice.get('finish_reason'))
+                for choice in sorted(body['choices'], key=lambda choice: choice.get('index', 0))
+            ]
+            content, finish_reason = (
+                self.api_client.pick_candidate(choices) if len(choices) > 1 else choices[0]
+            )
+        except (KeyError, IndexError, TypeError):
+            print(f"❌ Malformed batch result for {record.get('custom_id')}")
+            return None, 0
+
+        usage = body.get('usage') or {}
+        tokens = usage.get('total_tokens', 0)
+        if self.api_client.completion_lengths and 'completion_tokens' in usage:
+            self.api_client.completion_lengths.record(
+                record['custom_id'],
+                usage['completion_tokens'] if len(choices) == 1 else estimate_tokens(content),
+                truncated=finish_reason == 'length'
+            )
+        self.stats['total_tokens'] += tokens
+        self.stats['cached_tokens'] += (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+        return content, tokens
+
+    async def run(
+        self,
+        prompts: Iterable[Tuple[str, Dict]],
+        on_dispatch: Optional[Callable[[Dict], None]] = None
+    ) -> AsyncIterator[Tuple[Dict, Optional[str]]]:
+        """
+        Generate articles through the Batch API.
+
+        Cached responses are yielded right away; the remaining prompts are
+        submitted in batches of at most max_requests_per_batch lines. Batches
+        recorded by an interrupted run are re-attached instead of resubmitted
+        when they cover the same articles.
+
+        Args:
+            prompts: Iterable of tuples (prompt, article_info)
+            on_dispatch: Called with article_info when its request is submitted
+
+        Yields:
+            Tuples (article_info, content or None)
+        """
+        self.stats['start_time'] = time.time()
+        client = self.api_client
+
+        pending = {}
+        for prompt, article_info in prompts:
+            cache_key = None
+            if client.response_cache:
+                cache_key = client.get_cache_key(prompt, client.max_tokens_for(article_info['url_path']))
+            if cache_key and not client.cache_refresh:
+                cached = client.response_cache.get(cache_key)
+                if cached is not None:
+                    self.stats['cache_hits'] += 1
+                    yield article_info, cached
+                    continue
+            if client.cache_only:
+                print(f"⏭️  Cache miss for {article_info['title']} (cache-only mode, no API call)")
+                yield article_info, None
+                continue
+            pending[article_info['url_path']] = (prompt, article_info, cache_key)
+
+        if not pending:
+            self.stats['end_time'] = time.time()
+            return
+
+        async with client.create_session(1) as session:
+            # Re-attach to batches an interrupted run already paid for
+            batches = [
+                batch for batch in self.load_state()
+                if batch['custom_ids'] and all(custom_id in pending for custom_id in batch['custom_ids'])
+            ]
+            attached = {custom_id for batch in batches for custom_id in batch['custom_ids']}
+            for batch in batches:
+                self.stats['reattached'] += 1
+                print(f"🔗 Re-attaching to batch {batch['id']} ({len(batch['custom_ids'])} requests)")
+
+            remaining = [custom_id for custom_id in pending if custom_id not in attached]
+            for start in range(0, len(remaining), self.max_requests):
+                chunk = remaining[start:start + self.max_requests]
+                content = self.build_batch_file([(custom_id, pending[custom_id][0]) for custom_id in chunk])
+                file_id = await self.upload(session, content)
+                batch = await self.create_batch(session, file_id)
+                batches.append({'id': batch['id'], 'custom_ids': chunk})
+                self.save_state(batches)
+
+                self.stats['batches'] += 1
+                self.stats['submitted'] += len(chunk)
+                print(f"📤 Submitted batch {batch['id']} with {len(chunk)} requests "
+                      f"({len(content) / 1024:.0f} KB)")
+                if on_dispatch:
+                    for custom_id in chunk:
+                        on_dispatch(pending[custom_id][1])
+
+            for batch in list(batches):
+                final = await self.wait_for_batch(session, batch['id'])
+                print(f"📥 Batch {batch['id']} {final['status']}, downloading results...")
+
+                records = await self.download(session, final.get('output_file_id'))
+                records += await self.download(session, final.get('error_file_id'))
+
+                seen = set()
+                for record in records:
+                    custom_id = record.get('custom_id')
+                    if custom_id not in pending or custom_id in seen:
+                        continue
+                    seen.add(custom_id)
+
+                    prompt, article_info, cache_key = pending[custom_id]
+                    content, tokens = self.parse_record(record)
+                    if content is not None:
+                        self.stats['succeeded'] += 1
+                        if cache_key:
+                            client.response_cache.put(cache_key, content, tokens)
+                    else:
+                        self.stats['failed'] += 1
+                    yield article_info, content
+
+                # Requests missing from both files (expired or cancelled batches) count as failed
+                for custom_id in batch['custom_ids']:
+                    if custom_id not in seen:
+                        self.stats['failed'] += 1
+                        yield pending[custom_id][1], None
+
+                batches.remove(batch)
+                self.save_state(batches)
+
+        if client.completion_lengths:
+            client.completion_lengths.save()
+        self.stats['end_time'] = time.time()
+
+    def print_stats(self):
+        """Print formatted statistics."""
+        stats = self.stats
+        duration = (stats['end_time'] or time.time()) - (stats['start_time'] or time.time())
+
+        print("\n" + "=" * 60)
+        print("📦 BATCH API STATISTICS")
+        print("=" * 60)
+        print(f"Batches Submitted:    {stats['batches']}")
+        print(f"Batches Re-attached:  {stats['reattached']}")
+        print(f"Requests Submitted:   {stats['submitted']}")
+        print(f"Succeeded:            {stats['succeeded']} ✅")
+        print(f"Failed:               {stats['failed']} ❌")
+        print(f"Cache Hits:           {stats['cache_hits']} ♻️")
+        print(f"Total Tokens:         {stats['total_tokens']}")
+        print(f"Cached Prompt Tokens: {stats['cached_tokens']}")
+        print(f"Status Polls:         {stats['polls']}")
+        print(f"Duration:             {round(duration, 2)}s")
+        print("=" * 60 + "\n")
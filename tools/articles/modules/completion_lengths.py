@@ -0,0 +1,173 @@
+"""
+Completion Lengths Module
+Records how many completion tokens articles of each category actually use
+and suggests a per-category max_tokens (a high percentile plus headroom).
+Smaller reservations leave more of the tokens-per-minute quota for requests
+running in parallel. The history is persisted between runs.
+"""
+import json
+import math
+import os
+from typing import Dict, List, Optional
+
+
+def category_of(url_path: str) -> str:
+    """
+    Get the category of an article: the first URL segment.
+
+    Args:
+        url_path: URL path (e.g., '/bosses/white-wolf/')
+
+    Returns:
+        Category name (e.g., 'bosses')
+    """
+    return url_path.strip('/').split('/')[0] or 'root'
+
+
+class CompletionLengthTracker:
+    def __init__(self, default_max_tokens: int, config: Optional[Dict] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            default_max_tokens: Configured max_tokens, also the upper bound of any suggestion
+            config: Optional 'max_tokens_tuning' settings from config.json
+        """
+        config = config or {}
+
+        self.default_max_tokens = default_max_tokens
+        self.auto_apply = config.get('auto_apply', False)
+        self.history_path = config.get('history_file', 'tools/articles/cache/completion_lengths.json')
+        self.percentile = config.get('percentile', 99)
+        self.headroom = config.get('headroom', 0.15)
+        self.min_samples = config.get('min_samples', 30)
+        self.max_samples = config.get('max_samples', 2000)
+        self.min_tokens = config.get('min_tokens', 1024)
+
+        # category -> list of [completion_tokens, truncated]
+        self.samples: Dict[str, List[List]] = {}
+        self.dirty = 0
+
+    def load(self) -> bool:
+        """
+        Load the history from disk if it exists.
+
+        Returns:
+            bool: True if an existing history was loaded
+        """
+        if not os.path.exists(self.history_path):
+            return False
+
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                self.samples = json.load(f).get('categories', {})
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not read completion length history {self.history_path}: {str(e)}")
+            self.samples = {}
+            return False
+
+    def save(self):
+        """Atomically write the history to disk."""
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+        tmp_path = self.history_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'categories': self.samples}, f, sort_keys=True)
+        os.replace(tmp_path, self.history_path)
+        self.dirty = 0
+
+    def record(self, url_path: str, completion_tokens: int, truncated: bool = False):
+        """
+        Record the completion length of one finished request.
+
+        Args:
+            url_path: URL path of the article
+            completion_tokens: Completion tokens reported by usage
+            truncated: Whether the output hit max_tokens (its true length is unknown, but at least this)
+        """
+        samples = self.samples.setdefault(category_of(url_path), [])
+        samples.append([completion_tokens, truncated])
+        # Keep only the most recent samples so the suggestion follows template changes
+        if len(samples) > self.max_samples:
+            del samples[:len(samples) - self.max_samples]
+        self.dirty += 1
+
+    def suggest(self, category: str) -> Optional[int]:
+        """
+        Suggest max_tokens for a category.
+
+        Truncated samples count at the limit they hit, so a category that
+        keeps getting cut off drifts back up instead of shrinking further.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Suggested max_tokens, or None while there are too few samples
+        """
+        samples = self.samples.get(category, [])
+        if len(samples) < self.min_samples:
+            return None
+
+        lengths = sorted(tokens for tokens, _ in samples)
+        rank = max(0, math.ceil(self.percentile / 100 * len(lengths)) - 1)
+        suggested = lengths[rank] * (1 + self.headroom)
+
+        # Round up to a multiple of 128 and stay within [min_tokens, configured max_tokens]
+        suggested = int(math.ceil(suggested / 128) * 128)
+        return max(self.min_tokens, min(self.default_max_tokens, suggested))
+
+    def max_tokens_for(self, url_path: str) -> int:
+        """
+        Get the max_tokens to request for an article.
+
+        Args:
+            url_path: URL path of the article
+
+        Returns:
+            The category's suggestion when auto_apply is on, else the configured max_tokens
+        """
+        if self.auto_apply:
+            suggested = self.suggest(category_of(url_path))
+            if suggested is not None:
+                return suggested
+        return self.default_max_tokens
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Get per-category statistics.
+
+        Returns:
+            Dictionary mapping category to samples, p50, p99, truncated count and suggestion
+        """
+        stats = {}
+        for category, samples in sorted(self.samples.items()):
+            lengths = sorted(tokens for tokens, _ in samples)
+            if not lengths:
+                continue
+            stats[category] = {
+                'samples': len(lengths),
+                'p50': lengths[len(lengths) // 2],
+                'p99': lengths[max(0, math.ceil(0.99 * len(lengths)) - 1)],
+                'truncated': sum(1 for _, truncated in samples if truncated),
+                'suggested': self.suggest(category)
+            }
+        return stats
+
+    def print_suggestions(self):
+        """Print the per-category max_tokens suggestions."""
+        stats = self.get_stats()
+        if not stats:
+            return
+
+        mode = 'applied' if self.auto_apply else 'suggested only, set max_tokens_tuning.auto_apply to use'
+        print(f"\n📏 Completion length by category (max_tokens {self.default_max_tokens}, {mode}):")
+        for category, category_stats in stats.items():
+            suggested = category_stats['suggested']
+            print(f"  {category:<16} n={category_stats['samples']:<5} "
+                  f"p50={category_stats['p50']:<5} p99={category_stats['p99']:<5} "
+                  f"truncated={category_stats['truncated']:<3} "
+                  f"→ {suggested if suggested is not None else 'collecting samples'}")
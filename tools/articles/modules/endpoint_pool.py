@@ -0,0 +1,298 @@
+"""
+Endpoint Pool Module
+Spreads requests over several API endpoints / keys, each with its own
+concurrency limit, weight, rate controller and token budget. Requests are
+routed to the least-loaded (or fastest) healthy endpoint, and endpoints that
+keep failing are taken out of rotation for a growing cooldown.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Set
+
+from rate_controller import RateController
+from token_budget import TokenBudget
+
+
+class Endpoint:
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: str,
+        max_concurrency: int,
+        weight: float = 1.0,
+        tokens_per_minute: Optional[int] = None,
+        rate_control: Optional[Dict] = None
+    ):
+        """
+        Initialize one endpoint.
+
+        Args:
+            name: Label used in logs and stats
+            base_url: Chat completions URL
+            api_key: API key sent as a bearer token
+            max_concurrency: Requests this endpoint may have in flight
+            weight: Relative share of traffic
+            tokens_per_minute: TPM quota of this key (None or 0 to disable)
+            rate_control: 'rate_control' settings from config.json
+        """
+        self.name = name
+        self.base_url = base_url
+        self.weight = max(0.01, weight)
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        self.rate_controller = RateController(max_concurrency, rate_control or {})
+        self.token_budget = TokenBudget(tokens_per_minute) if tokens_per_minute else None
+
+        # Passive health: consecutive failures put the endpoint on a cooldown
+        self.latency = None  # EWMA of successful request latency
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.cooldown = 0.0
+
+        self.stats = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'ejections': 0
+        }
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.rate_controller.max_concurrency
+
+    def is_healthy(self, now: float) -> bool:
+        """Check whether the endpoint is out of its failure cooldown."""
+        return now >= self.unhealthy_until
+
+    def load(self) -> float:
+        """Fraction of the endpoint's current concurrency limit in use, scaled by weight."""
+        return (self.rate_controller.in_flight + 1) / (self.rate_controller.concurrency_limit * self.weight)
+
+    def expected_latency(self) -> float:
+        """Expected wait for one more request, for latency-aware routing."""
+        # Endpoints without a sample yet are tried first
+        return (self.latency or 0.0) * (self.rate_controller.in_flight + 1) / self.weight
+
+    def get_stats(self) -> Dict:
+        """
+        Get endpoint statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.stats.copy()
+        stats['name'] = self.name
+        stats['healthy'] = self.is_healthy(time.monotonic())
+        stats['latency'] = round(self.latency, 3) if self.latency is not None else None
+        stats['rate_control'] = self.rate_controller.get_stats()
+        stats['token_budget'] = self.token_budget.get_stats() if self.token_budget else None
+        return stats
+
+
+class EndpointPool:
+    # Routing strategies
+    LEAST_LOADED = 'least_loaded'
+    LATENCY = 'latency'
+
+    def __init__(self, config: Dict):
+        """
+        Initialize the pool from config.json.
+
+        Without an 'endpoints' list, the top-level api_base_url, api_key,
+        concurrent_limit and tokens_per_minute form a single endpoint.
+
+        Args:
+            config: Configuration dictionary with API settings
+        """
+        rate_control = config.get('rate_control', {})
+        entries = config.get('endpoints') or [{}]
+
+        self.endpoints: List[Endpoint] = []
+        for index, entry in enumerate(entries):
+            self.endpoints.append(Endpoint(
+                name=entry.get('name', f"endpoint-{index + 1}" if len(entries) > 1 else 'default'),
+                base_url=entry.get('api_base_url', config.get('api_base_url')),
+                api_key=entry.get('api_key', config.get('api_key')),
+                max_concurrency=entry.get('concurrent_limit', config.get('concurrent_limit', 100)),
+                weight=entry.get('weight', 1.0),
+                tokens_per_minute=entry.get('tokens_per_minute', config.get('tokens_per_minute')),
+                rate_control=rate_control
+            ))
+
+        health = config.get('endpoint_health', {})
+        self.routing = config.get('routing', self.LEAST_LOADED)
+        self.failure_threshold = health.get('failure_threshold', 3)
+        self.cooldown_seconds = health.get('cooldown_seconds', 10)
+        self.max_cooldown_seconds = health.get('max_cooldown_seconds', 300)
+        self.latency_smoothing = health.get('latency_smoothing', 0.2)
+        self.slot_freed = asyncio.Event()
+
+        self.stats = {
+            'failovers': 0
+        }
+
+    @property
+    def total_concurrency(self) -> int:
+        """Requests the whole pool may have in flight."""
+        return sum(endpoint.max_concurrency for endpoint in self.endpoints)
+
+    def pick(self, exclude: Optional[Set[Endpoint]] = None) -> Optional[Endpoint]:
+        """
+        Choose the endpoint for the next request without waiting.
+
+        Args:
+            exclude: Endpoints to avoid while any other one is in rotation (failover)
+
+        Returns:
+            The best healthy endpoint with a free slot, or None
+        """
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.is_healthy(now)]
+        if exclude:
+            # A busy healthy endpoint is waited for rather than retrying on the one that
+            # just failed; excluded endpoints are used only when nothing else is left
+            candidates = [endpoint for endpoint in candidates if endpoint not in exclude] or candidates
+        ready = [endpoint for endpoint in candidates if endpoint.rate_controller.has_capacity()]
+        if not ready:
+            return None
+
+        if self.routing == self.LATENCY:
+            return min(ready, key=lambda endpoint: endpoint.expected_latency())
+        return min(ready, key=lambda endpoint: endpoint.load())
+
+    async def acquire(self, exclude: Optional[Set[Endpoint]] = None, tokens: int = 0) -> Endpoint:
+        """
+        Wait for a slot on the best available endpoint.
+
+        The endpoint's token budget is reserved before its slot is taken, so
+        a request waiting for TPM headroom does not hold a concurrency slot.
+
+        Args:
+            exclude: Endpoints that just failed this request, avoided while another is in rotation
+            tokens: Tokens to reserve on the endpoint's budget, if it has one
+                (settle them with endpoint.token_budget.settle() afterwards)
+
+        Returns:
+            Endpoint whose slot is now held (release it with release())
+        """
+        while True:
+            endpoint = self.pick(exclude)
+            if endpoint is not None:
+                if exclude and endpoint not in exclude:
+                    self.stats['failovers'] += 1
+                endpoint.stats['requests'] += 1
+                reserved = bool(endpoint.token_budget and tokens)
+                if reserved:
+                    await endpoint.token_budget.reserve(tokens)
+                try:
+                    # A free slot was just checked, so this usually only waits for pacing
+                    # (or for a slot taken by another request during the reservation)
+                    await endpoint.rate_controller.acquire()
+                except BaseException:
+                    if reserved:
+                        endpoint.token_budget.settle(tokens, 0)
+                    raise
+                return endpoint
+
+            # Every endpoint is busy, paused or cooling down: wait for a change
+            self.slot_freed.clear()
+            try:
+                await asyncio.wait_for(self.slot_freed.wait(), timeout=self.next_change())
+            except asyncio.TimeoutError:
+                pass
+
+    def next_change(self) -> float:
+        """Seconds until a paused or unhealthy endpoint may become available again."""
+        now = time.monotonic()
+        waits = [endpoint.unhealthy_until - now for endpoint in self.endpoints]
+        waits += [endpoint.rate_controller.paused_until - now for endpoint in self.endpoints]
+        waits = [wait for wait in waits if wait > 0]
+        return min(waits + [1.0])
+
+    def has_alternative(self, endpoint: Endpoint) -> bool:
+        """
+        Check whether any other endpoint is still in rotation.
+
+        Args:
+            endpoint: Endpoint to leave out
+
+        Returns:
+            bool: True if another endpoint is out of its failure cooldown
+        """
+        now = time.monotonic()
+        return any(other is not endpoint and other.is_healthy(now) for other in self.endpoints)
+
+    def release(self, endpoint: Endpoint):
+        """
+        Return an endpoint slot.
+
+        Args:
+            endpoint: Endpoint returned by acquire()
+        """
+        endpoint.rate_controller.release()
+        self.slot_freed.set()
+
+    def record(self, endpoint: Endpoint, healthy: Optional[bool], latency: Optional[float] = None):
+        """
+        Update an endpoint's passive health after one attempt.
+
+        Args:
+            endpoint: Endpoint that served the attempt
+            healthy: True on success, False on a retryable failure, None when
+                the outcome says nothing about the endpoint (429, fatal 4xx)
+            latency: Request latency in seconds (successes only)
+        """
+        if healthy is True:
+            endpoint.stats['successes'] += 1
+            endpoint.consecutive_failures = 0
+            endpoint.cooldown = 0.0
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += self.latency_smoothing * (latency - endpoint.latency)
+        elif healthy is False:
+            endpoint.stats['failures'] += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= self.failure_threshold and len(self.endpoints) > 1:
+                self.eject(endpoint)
+
+    def eject(self, endpoint: Endpoint):
+        """
+        Take a failing endpoint out of rotation, doubling the cooldown each time.
+
+        Args:
+            endpoint: Endpoint to eject
+        """
+        now = time.monotonic()
+        if not endpoint.is_healthy(now):
+            return
+
+        endpoint.cooldown = min(
+            self.max_cooldown_seconds,
+            endpoint.cooldown * 2 if endpoint.cooldown else self.cooldown_seconds
+        )
+        endpoint.unhealthy_until = now + endpoint.cooldown
+        endpoint.stats['ejections'] += 1
+        print(f"🚑 Endpoint {endpoint.name} failed {endpoint.consecutive_failures} times in a row, "
+              f"routing around it for {endpoint.cooldown:.0f}s")
+
+    def get_stats(self) -> Dict:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with pool totals and per-endpoint statistics
+        """
+        endpoints = [endpoint.get_stats() for endpoint in self.endpoints]
+        return {
+            'routing': self.routing,
+            'failovers': self.stats['failovers'],
+            'rate_limited': sum(stats['rate_control']['rate_limited'] for stats in endpoints),
+            'concurrency_limit': round(sum(e.rate_controller.concurrency_limit for e in self.endpoints), 2),
+            'in_flight': sum(e.rate_controller.in_flight for e in self.endpoints),
+            'endpoints': endpoints
+        }
@@ -1,45 +1,123 @@
 """
 Excel Parser Module
-Reads article data from Excel file and validates the structure.
+Reads article data from the input sheet and validates the structure.
+The sheet can be XLSX, CSV, JSONL, JSON or Parquet (see input_sources).
+
+By default the sheet is loaded into a DataFrame once. In streaming mode
+it is read row by row instead (openpyxl's read-only reader for XLSX),
+so memory stays constant however many rows the sheet has.
 """
+import collections
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 import os
+import time
+
+from input_sources import SOURCES, source_for
+from workbook_cache import WorkbookCache
+
+
+# Article table columns, in the order records are built from them
+ARTICLE_COLUMNS = ['url_path', 'title', 'keyword', 'reference', 'priority']
+
+# Sheet columns every input must have
+REQUIRED_COLUMNS = ['URL Path', 'Article Title', 'Keyword', 'Reference Link']
+
+
+class ArticleRecord:
+    """
+    One article row. Slotted to stay small on very large sheets, and
+    indexable like the dictionaries the rest of the pipeline expects
+    (article['url_path'], article.get('priority')).
+    """
+    __slots__ = tuple(ARTICLE_COLUMNS)
+
+    def __init__(self, url_path: str, title: str, keyword: str, reference: str, priority: Optional[int]):
+        self.url_path = url_path
+        self.title = title
+        self.keyword = keyword
+        self.reference = reference
+        self.priority = priority
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> Dict:
+        return {column: getattr(self, column) for column in ARTICLE_COLUMNS}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ArticleRecord) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord({self.to_dict()!r})"
 
 
 class ExcelParser:
-    def __init__(self, excel_file_path: str, priority_range: tuple = None):
+    def __init__(
+        self,
+        excel_file_path: str,
+        priority_range: tuple = None,
+        cache_dir: Optional[str] = None,
+        streaming: bool = False
+    ):
         """
         Initialize the Excel parser.
 
         Args:
-            excel_file_path: Path to the Excel file
+            excel_file_path: Path to the input sheet (.xlsx, .csv, .jsonl, .json or .parquet)
             priority_range: Optional tuple (min_priority, max_priority) to filter articles
+            cache_dir: Optional directory for the parsed-workbook cache
+            streaming: Read rows lazily in read-only mode instead of loading a DataFrame
         """
         self.excel_file_path = excel_file_path
+        self.source = source_for(excel_file_path)
         self.priority_range = priority_range
+        self.workbook_cache = WorkbookCache(cache_dir) if cache_dir else None
+        self.streaming = streaming
         self.data = None
         self.original_data = None  # Store original data before filtering
+        self.table = None  # Typed article table, built once by load_data()
+        self.skipped_rows = []
+
+        # Streaming mode: header positions, plus stats gathered during the last pass
+        self.columns = None
+        self.stream_stats = None
+        self.stream_complete = False
+        self.url_errors = []
 
     def load_data(self) -> bool:
         """
-        Load and validate Excel file.
+        Load and validate the input sheet.
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             if not os.path.exists(self.excel_file_path):
-                print(f"❌ Error: Excel file not found at {self.excel_file_path}")
+                print(f"❌ Error: Input file not found at {self.excel_file_path}")
                 return False
 
-            # Read Excel file
-            self.original_data = pd.read_excel(self.excel_file_path)
+            if self.source is None:
+                print(f"❌ Error: Unsupported input format {self.excel_file_path} "
+                      f"(expected one of {', '.join(sorted(SOURCES))})")
+                return False
+
+            if self.streaming:
+                return self.open_stream()
+
+            # Read the sheet (or its parsed copy, if an XLSX workbook is unchanged)
+            self.original_data = self.read_sheet()
             self.data = self.original_data.copy()
 
             # Validate required columns
-            required_columns = ['URL Path', 'Article Title', 'Keyword', 'Reference Link']
-            missing_columns = [col for col in required_columns if col not in self.data.columns]
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in self.data.columns]
 
             if missing_columns:
                 print(f"❌ Error: Missing required columns: {', '.join(missing_columns)}")
@@ -55,83 +133,258 @@ class ExcelParser:
                         (self.data['Priority'] <= max_priority)
                     ]
                     filtered_count = len(self.data)
-                    print(f"✅ Successfully loaded {original_count} articles from Excel")
+                    print(f"✅ Successfully loaded {original_count} articles from {self.source.label}")
                     print(f"🎯 Filtered to {filtered_count} articles (Priority {min_priority}-{max_priority})")
                 else:
                     print(f"⚠️  Warning: Priority column not found, loading all articles")
-                    print(f"✅ Successfully loaded {len(self.data)} articles from Excel")
+                    print(f"✅ Successfully loaded {len(self.data)} articles from {self.source.label}")
             else:
-                print(f"✅ Successfully loaded {len(self.data)} articles from Excel")
+                print(f"✅ Successfully loaded {len(self.data)} articles from {self.source.label}")
 
+            self.table = self.build_table(self.data)
             return True
 
         except Exception as e:
-            print(f"❌ Error loading Excel file: {str(e)}")
+            print(f"❌ Error loading {self.source.label if self.source else 'input'} file: {str(e)}")
             return False
 
-    def get_articles(self) -> List[Dict[str, str]]:
+    def read_sheet(self) -> pd.DataFrame:
+        """
+        Read the sheet, using the parsed-workbook cache when available.
+
+        Only slow formats (XLSX) are cached; the others parse faster than
+        the cache itself would load.
+
+        Returns:
+            Sheet rows as a DataFrame
+        """
+        started = time.perf_counter()
+        use_cache = self.workbook_cache is not None and self.source.cacheable
+        if use_cache:
+            data = self.workbook_cache.load(self.excel_file_path)
+            if data is not None:
+                print(f"⚡ Workbook loaded from cache in {time.perf_counter() - started:.2f}s")
+                return data
+
+        data = self.source.read_frame()
+        print(f"📖 {self.source.label} sheet parsed in {time.perf_counter() - started:.2f}s")
+
+        if use_cache:
+            self.workbook_cache.save(self.excel_file_path, data)
+        return data
+
+    def open_stream(self) -> bool:
+        """
+        Check the header row for streaming mode without reading any data rows.
+
+        Returns:
+            bool: True if all required columns are present
+        """
+        header = self.source.read_header()
+        self.columns = {name: index for index, name in enumerate(header) if name is not None}
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in self.columns]
+        if missing_columns:
+            print(f"❌ Error: Missing required columns: {', '.join(missing_columns)}")
+            return False
+
+        if self.priority_range and 'Priority' not in self.columns:
+            print(f"⚠️  Warning: Priority column not found, loading all articles")
+        print(f"✅ Streaming articles from {self.source.label} (rows are read as they are needed)")
+        return True
+
+    def iter_stream(self) -> Iterator[ArticleRecord]:
+        """
+        Read the sheet row by row, keeping only the current row in memory.
+
+        Priority statistics, skipped rows and URL format errors are
+        gathered during the same pass.
+
+        Yields:
+            ArticleRecord for each valid row inside the priority filter
+        """
+        url_column = self.columns['URL Path']
+        title_column = self.columns['Article Title']
+        keyword_column = self.columns['Keyword']
+        reference_column = self.columns['Reference Link']
+        priority_column = self.columns.get('Priority')
+
+        distribution = collections.Counter()
+        self.stream_stats = {'total': 0, 'distribution': distribution, 'filtered_count': 0}
+        self.skipped_rows = []
+        self.url_errors = []
+        self.stream_complete = False
+        position = 0
+
+        def cell(row: tuple, column: Optional[int]):
+            return row[column] if column is not None and column < len(row) else None
+
+        rows = self.source.iter_rows()
+        try:
+            for number, row in enumerate(rows, start=1):
+                if all(value is None for value in row):
+                    continue
+                self.stream_stats['total'] += 1
+
+                priority = None
+                if priority_column is not None:
+                    try:
+                        priority = int(float(cell(row, priority_column)))
+                    except (TypeError, ValueError):
+                        priority = None
+                    if priority is not None:
+                        distribution[priority] += 1
+                    if self.priority_range:
+                        min_priority, max_priority = self.priority_range
+                        if priority is None or not min_priority <= priority <= max_priority:
+                            continue
+                self.stream_stats['filtered_count'] += 1
+
+                url_path, title, keyword = cell(row, url_column), cell(row, title_column), cell(row, keyword_column)
+                if url_path is None or title is None or keyword is None:
+                    self.skipped_rows.append(number)
+                    if len(self.skipped_rows) <= 3:
+                        print(f"⚠️  Warning: Skipping row {number} due to missing data")
+                    continue
+
+                record = ArticleRecord(
+                    str(url_path).strip(),
+                    str(title).strip(),
+                    str(keyword).strip(),
+                    str(cell(row, reference_column) or '').strip(),
+                    priority
+                )
+
+                position += 1
+                if not record.url_path.startswith('/'):
+                    self.url_errors.append(f"Row {position}: URL path should start with '/' - got '{record.url_path}'")
+                if not record.url_path.endswith('/'):
+                    self.url_errors.append(f"Row {position}: URL path should end with '/' - got '{record.url_path}'")
+
+                yield record
+            self.stream_complete = True
+        finally:
+            rows.close()
+
+        if len(self.skipped_rows) > 3:
+            print(f"⚠️  Warning: Skipped {len(self.skipped_rows)} rows in total due to missing data")
+
+    def build_table(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Get all articles as a list of dictionaries.
+        Build the typed article table in one vectorized pass.
+
+        Rows missing a URL path, title or keyword are dropped (and reported
+        once); text columns are stripped and priorities converted to integers.
+
+        Args:
+            data: Sheet rows after the priority filter
 
         Returns:
-            List of article dictionaries with keys: url_path, title, keyword, reference
+            DataFrame with ARTICLE_COLUMNS, one row per valid article
+        """
+        missing = data[['URL Path', 'Article Title', 'Keyword']].isna().any(axis=1)
+        self.skipped_rows = [index + 1 for index in data.index[missing.to_numpy()]]
+        if self.skipped_rows:
+            shown = ', '.join(str(row) for row in self.skipped_rows[:3])
+            more = f" and {len(self.skipped_rows) - 3} more" if len(self.skipped_rows) > 3 else ''
+            print(f"⚠️  Warning: Skipping {len(self.skipped_rows)} rows due to missing data (row {shown}{more})")
+
+        valid = data[~missing]
+        if 'Priority' in valid.columns:
+            priority = np.trunc(pd.to_numeric(valid['Priority'], errors='coerce')).astype('Int64')
+        else:
+            priority = pd.Series(pd.NA, index=valid.index, dtype='Int64')
+
+        return pd.DataFrame({
+            'url_path': valid['URL Path'].astype(str).str.strip(),
+            'title': valid['Article Title'].astype(str).str.strip(),
+            'keyword': valid['Keyword'].astype(str).str.strip(),
+            'reference': valid['Reference Link'].fillna('').astype(str).str.strip(),
+            'priority': priority
+        }, columns=ARTICLE_COLUMNS).reset_index(drop=True)
+
+    def iter_articles(self) -> Iterator[ArticleRecord]:
         """
-        if self.data is None:
+        Iterate over valid articles one row at a time.
+
+        Yields:
+            ArticleRecord with fields: url_path, title, keyword, reference, priority
+        """
+        if self.streaming and self.columns is not None:
+            yield from self.iter_stream()
+            return
+
+        if self.table is None:
             print("❌ Error: Data not loaded. Call load_data() first.")
-            return []
+            return
 
-        articles = []
-        for index, row in self.data.iterrows():
-            # Skip rows with missing essential data
-            if pd.isna(row['URL Path']) or pd.isna(row['Article Title']) or pd.isna(row['Keyword']):
-                print(f"⚠️  Warning: Skipping row {index + 1} due to missing data")
-                continue
+        priorities = [None if pd.isna(value) else int(value) for value in self.table['priority'].tolist()]
+        columns = [self.table[column].tolist() for column in ARTICLE_COLUMNS[:-1]] + [priorities]
+        for values in zip(*columns):
+            yield ArticleRecord(*values)
 
-            article = {
-                'url_path': str(row['URL Path']).strip(),
-                'title': str(row['Article Title']).strip(),
-                'keyword': str(row['Keyword']).strip(),
-                'reference': str(row['Reference Link']).strip() if not pd.isna(row['Reference Link']) else ''
-            }
-            articles.append(article)
+    def get_articles(self) -> List[ArticleRecord]:
+        """
+        Get all articles as a list.
 
-        return articles
+        Returns:
+            List of ArticleRecord with fields: url_path, title, keyword, reference, priority
+        """
+        return list(self.iter_articles())
+
+    def has_priority(self) -> bool:
+        """
+        Check whether the sheet has a Priority column.
+
+        Returns:
+            bool: True if articles carry a priority to order them by
+        """
+        if self.streaming:
+            return self.columns is not None and 'Priority' in self.columns
+        return self.original_data is not None and 'Priority' in self.original_data.columns
 
     def get_article_count(self) -> int:
         """
         Get total number of valid articles.
 
+        In streaming mode this reads the whole sheet once more.
+
         Returns:
             int: Number of articles
         """
-        return len(self.get_articles())
+        if self.streaming:
+            return sum(1 for _ in self.iter_articles())
+        return len(self.table) if self.table is not None else 0
 
     def validate_url_paths(self) -> List[str]:
         """
         Validate URL paths and return any issues.
 
+        In streaming mode the checks run during iteration, so this returns
+        the errors found by the last pass over the sheet.
+
         Returns:
             List of validation error messages
         """
-        errors = []
-        articles = self.get_articles()
+        if self.streaming:
+            return self.url_errors
+        if self.table is None:
+            return []
 
-        for idx, article in enumerate(articles):
-            url_path = article['url_path']
+        # Category validation removed - now accepts all categories
+        url_paths = self.table['url_path']
+        bad_start = ~url_paths.str.startswith('/')
+        bad_end = ~url_paths.str.endswith('/')
 
-            # Check if URL path starts with /
-            if not url_path.startswith('/'):
+        errors = []
+        for idx in np.flatnonzero((bad_start | bad_end).to_numpy()):
+            url_path = url_paths.iat[idx]
+            if bad_start.iat[idx]:
                 errors.append(f"Row {idx + 1}: URL path should start with '/' - got '{url_path}'")
-
-            # Check if URL path ends with /
-            if not url_path.endswith('/'):
+            if bad_end.iat[idx]:
                 errors.append(f"Row {idx + 1}: URL path should end with '/' - got '{url_path}'")
 
-            # Category validation removed - now accepts all categories
-
         return errors
 
-
     def get_priority_stats(self) -> Dict:
         """
         Get priority distribution statistics.
@@ -139,6 +392,11 @@ class ExcelParser:
         Returns:
             Dictionary with priority statistics
         """
+        if self.streaming:
+            if self.stream_stats is None or 'Priority' not in self.columns:
+                return {}
+            return dict(self.stream_stats, distribution=dict(self.stream_stats['distribution']))
+
         if self.original_data is None or 'Priority' not in self.original_data.columns:
             return {}
 
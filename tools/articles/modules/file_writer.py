@@ -4,21 +4,26 @@ Handles saving generated MDX articles to the correct directories.
 """
 import os
 import re
+import time
 from typing import Dict, Optional
 from datetime import datetime
 
+from metrics import MetricsRegistry
+
 
 class FileWriter:
-    def __init__(self, output_dir: str, site_domain: str):
+    def __init__(self, output_dir: str, site_domain: str, metrics: Optional[MetricsRegistry] = None):
         """
         Initialize the file writer.
 
         Args:
             output_dir: Base output directory (e.g., 'src/content/')
             site_domain: Site domain for canonical URLs
+            metrics: Optional MetricsRegistry for validation/write timings
         """
         self.output_dir = output_dir
         self.site_domain = site_domain
+        self.metrics = metrics
         self.stats = {
             'saved': 0,
             'skipped': 0,
@@ -53,6 +58,45 @@ class FileWriter:
 
         return category, filename
 
+    def get_file_path(self, url_path: str) -> str:
+        """
+        Get the output file path for a URL path.
+
+        Args:
+            url_path: URL path like '/codes/pixel-blade-codes/'
+
+        Returns:
+            Full path of the MDX file
+        """
+        category, filename = self.extract_category_and_filename(url_path)
+        return os.path.join(self.output_dir, category, filename)
+
+    def article_exists(self, url_path: str) -> bool:
+        """
+        Check whether the MDX file for a URL path already exists.
+
+        Args:
+            url_path: URL path of the article
+
+        Returns:
+            bool: True if the file exists
+        """
+        try:
+            return os.path.exists(self.get_file_path(url_path))
+        except ValueError:
+            return False
+
+    def mark_skipped(self, article_info: Dict, reason: str = "already exists"):
+        """
+        Count an article that was skipped before generation.
+
+        Args:
+            article_info: Dictionary with article metadata
+            reason: Why the article was skipped
+        """
+        print(f"⏭️  Skipping {article_info['url_path']} ({reason})")
+        self.stats['skipped'] += 1
+
     def validate_mdx_content(self, content: str) -> tuple:
         """
         Validate MDX content structure.
@@ -115,7 +159,10 @@ class FileWriter:
         """
         try:
             # Validate content first
+            validation_started = time.perf_counter()
             is_valid, error_msg = self.validate_mdx_content(content)
+            if self.metrics:
+                self.metrics.observe('validation_seconds', time.perf_counter() - validation_started)
             if not is_valid:
                 print(f"❌ Validation failed for {article_info['title']}: {error_msg}")
                 self.stats['errors'] += 1
@@ -124,12 +171,9 @@ class FileWriter:
             # Extract category and filename
             category, filename = self.extract_category_and_filename(article_info['url_path'])
 
-            # Create full directory path
-            dir_path = os.path.join(self.output_dir, category)
-            os.makedirs(dir_path, exist_ok=True)
-
-            # Create full file path
-            file_path = os.path.join(dir_path, filename)
+            # Create full file path and its directory
+            file_path = self.get_file_path(article_info['url_path'])
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
             # Check if file exists
             if os.path.exists(file_path) and not overwrite:
@@ -138,8 +182,11 @@ class FileWriter:
                 return False
 
             # Save file
+            write_started = time.perf_counter()
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
+            if self.metrics:
+                self.metrics.observe('write_seconds', time.perf_counter() - write_started)
 
             print(f"✅ Saved: {category}/{filename}")
             self.stats['saved'] += 1
@@ -183,6 +230,15 @@ class FileWriter:
         """
         return self.stats.copy()
 
+    def collect_gauges(self) -> Dict[str, int]:
+        """
+        Current writer state for metrics export.
+
+        Returns:
+            Dictionary of gauge values
+        """
+        return {f"files_{key}": value for key, value in self.stats.items()}
+
     def print_stats(self):
         """Print formatted statistics."""
         stats = self.get_stats()
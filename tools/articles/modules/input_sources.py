@@ -0,0 +1,199 @@
+"""
+Input Sources Module
+Readers for the article sheet in the formats the rest of the site already
+produces. Every source exposes the same columns (URL Path, Article Title,
+Keyword, Reference Link, Priority) and is picked by file extension.
+
+Each source can read the whole file into a DataFrame or iterate over its
+rows lazily; CSV, JSONL, Parquet and XLSX rows are streamed, plain JSON
+arrays are loaded first.
+"""
+import csv
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import openpyxl
+import pandas as pd
+
+
+# Text columns are read as strings so numeric-looking keywords stay verbatim
+TEXT_COLUMNS = ['URL Path', 'Article Title', 'Keyword', 'Reference Link']
+
+
+class InputSource:
+    """Base class of the input readers."""
+
+    # Human-readable format name used in log messages
+    label = 'Input'
+    # Whether parsing is slow enough for the parsed-workbook cache to pay off
+    cacheable = False
+
+    def __init__(self, path: str):
+        """
+        Initialize the source.
+
+        Args:
+            path: Path to the input file
+        """
+        self.path = path
+
+    def read_frame(self) -> pd.DataFrame:
+        """
+        Read every row at once.
+
+        Returns:
+            DataFrame with one column per header field
+        """
+        raise NotImplementedError
+
+    def read_header(self) -> List[str]:
+        """
+        Read only the column names.
+
+        Returns:
+            Column names, in the order iter_rows() returns values
+        """
+        raise NotImplementedError
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        """
+        Iterate over data rows one at a time.
+
+        Yields:
+            Tuple of values aligned with read_header(); empty cells are None
+        """
+        raise NotImplementedError
+
+
+class XlsxSource(InputSource):
+    label = 'Excel'
+    cacheable = True
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_excel(self.path)
+
+    def read_header(self) -> List[str]:
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            return list(next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ()))
+        finally:
+            workbook.close()
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        # Read-only mode parses the sheet XML incrementally. The first sheet
+        # is read, not the active one, to match pd.read_excel()
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            yield from workbook.worksheets[0].iter_rows(min_row=2, values_only=True)
+        finally:
+            workbook.close()
+
+
+class CsvSource(InputSource):
+    label = 'CSV'
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_csv(
+            self.path,
+            encoding='utf-8-sig',
+            dtype={column: str for column in TEXT_COLUMNS},
+            keep_default_na=False,
+            na_values=['']
+        )
+
+    def read_header(self) -> List[str]:
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            return next(csv.reader(f), [])
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                yield tuple(value if value != '' else None for value in row)
+
+
+class JsonlSource(InputSource):
+    label = 'JSONL'
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_json(self.path, lines=True, dtype=False, convert_dates=False)
+
+    def iter_records(self) -> Iterator[dict]:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def read_header(self) -> List[str]:
+        # Column names come from the first record
+        return list(next(self.iter_records(), {}))
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        header = self.read_header()
+        for record in self.iter_records():
+            yield tuple(record.get(column) for column in header)
+
+
+class JsonSource(JsonlSource):
+    """A JSON array of row objects, as written by scripts/csv-to-json.js."""
+    label = 'JSON'
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_json(self.path, dtype=False, convert_dates=False)
+
+    def iter_records(self) -> Iterator[dict]:
+        # The standard library cannot stream a JSON array, so it is loaded whole
+        with open(self.path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+class ParquetSource(InputSource):
+    label = 'Parquet'
+
+    # Rows decoded per record batch while streaming
+    batch_size = 8192
+
+    def read_frame(self) -> pd.DataFrame:
+        return pd.read_parquet(self.path)
+
+    def open_file(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Reading Parquet input requires pyarrow (pip install pyarrow)") from None
+        return pyarrow.parquet.ParquetFile(self.path)
+
+    def read_header(self) -> List[str]:
+        return list(self.open_file().schema_arrow.names)
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        for batch in self.open_file().iter_batches(batch_size=self.batch_size):
+            yield from zip(*(column.to_pylist() for column in batch.columns))
+
+
+# File extension -> source class
+SOURCES = {
+    '.xlsx': XlsxSource,
+    '.xlsm': XlsxSource,
+    '.csv': CsvSource,
+    '.jsonl': JsonlSource,
+    '.ndjson': JsonlSource,
+    '.json': JsonSource,
+    '.parquet': ParquetSource
+}
+
+
+def source_for(path: str) -> Optional[InputSource]:
+    """
+    Get the reader for an input file from its extension.
+
+    Args:
+        path: Path to the input file
+
+    Returns:
+        Matching InputSource, or None if the extension is not supported
+    """
+    source_class = SOURCES.get(os.path.splitext(path)[1].lower())
+    return source_class(path) if source_class else None
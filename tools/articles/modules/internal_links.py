@@ -8,6 +8,8 @@ Manages internal links and provides smart link selection for articles.
 - 如果正在生成 /codes/pixel-blade-codes/ 文章
 - 系统会优先选择其他 codes 类别的文章链接
 - 如果同类别链接不够，才会从其他类别选择
+- 随机数种子由文章 URL 的哈希决定：同一篇文章每次运行都选到相同的链接，
+  提示词逐字节相同，响应缓存和提示词对比才有效
 
 2. 避免自链接
 自动过滤掉文章自己的URL，防止文章链接到自己。
@@ -19,7 +21,8 @@ Manages internal links and provides smart link selection for articles.
   - [How To Get 
   Wishes](https://pixelbladegame.org/guides/how-to-get-wishes/)
 """
-from typing import Dict, List
+from typing import Dict, List, Set
+import hashlib
 import random
 
 
@@ -35,6 +38,76 @@ class InternalLinksManager:
         self.links_config = links_config
         self.site_domain = site_domain
 
+        # Selection index, built once: per-category and flattened link lists
+        # (duplicates removed, config order kept) with membership sets
+        self.category_links = {
+            category: list(dict.fromkeys(links))
+            for category, links in links_config.items()
+        }
+        self.category_sets = {
+            category: set(links)
+            for category, links in self.category_links.items()
+        }
+        self.all_links = list(dict.fromkeys(
+            link for links in self.category_links.values() for link in links
+        ))
+        self.all_set = set(self.all_links)
+
+    @staticmethod
+    def rng_for(url_path: str) -> random.Random:
+        """
+        Get a random generator seeded from the article's URL path.
+
+        Python's built-in hash() is salted per process, so the seed comes
+        from SHA-256 instead and is stable across runs and machines.
+
+        Args:
+            url_path: URL path of the article
+
+        Returns:
+            random.Random seeded for this article
+        """
+        digest = hashlib.sha256(url_path.encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    @staticmethod
+    def sample_links(
+        pool: List[str],
+        pool_set: Set[str],
+        count: int,
+        exclude: Set[str],
+        rng: random.Random
+    ) -> List[str]:
+        """
+        Pick up to count distinct links from pool, skipping excluded ones.
+
+        Picks random positions and rejects excluded or repeated links, so
+        the cost depends on count rather than the size of the pool. Only a
+        pool with no more than count usable links is scanned whole.
+
+        Args:
+            pool: Candidate links
+            pool_set: Set of the same links
+            count: Number of links wanted
+            exclude: Links that must not be picked
+            rng: Seeded random generator
+
+        Returns:
+            Selected links
+        """
+        available = len(pool) - sum(1 for link in exclude if link in pool_set)
+        if available <= count:
+            return [link for link in pool if link not in exclude]
+
+        picked = []
+        seen = set(exclude)
+        while len(picked) < count:
+            link = pool[rng.randrange(len(pool))]
+            if link not in seen:
+                seen.add(link)
+                picked.append(link)
+        return picked
+
     def get_category_from_url(self, url_path: str) -> str:
         """
         Extract category from URL path.
@@ -58,6 +131,9 @@ class InternalLinksManager:
         """
         Select internal links for an article.
 
+        The selection is deterministic: it depends only on url_path and
+        the configured links, so reruns build identical prompts.
+
         Args:
             url_path: URL path of the current article
             num_links: Number of links to select
@@ -67,48 +143,30 @@ class InternalLinksManager:
             List of selected internal link paths
         """
         category = self.get_category_from_url(url_path)
-        selected = []
-
-        # Get all available links except the current article
-        all_links = []
-        for cat, links in self.links_config.items():
-            for link in links:
-                if link != url_path:  # Don't link to self
-                    all_links.append((cat, link))
+        rng = self.rng_for(url_path)
+        exclude = {url_path}  # Don't link to self
 
         # If prefer same category, try to get links from same category first
-        if prefer_same_category and category in self.links_config:
-            same_category_links = [
-                link for link in self.links_config[category]
-                if link != url_path
-            ]
-
-            if len(same_category_links) >= num_links:
-                # We have enough links in the same category
-                selected = random.sample(same_category_links, num_links)
-            elif same_category_links:
-                # Use all same-category links and supplement with others
-                selected.extend(same_category_links)
-                remaining = num_links - len(selected)
-
-                # Get links from other categories
-                other_links = [
-                    link for cat, link in all_links
-                    if cat != category and link not in selected
-                ]
-
-                if other_links:
-                    selected.extend(random.sample(
-                        other_links,
-                        min(remaining, len(other_links))
-                    ))
-
-        # If we still don't have enough links, randomly select from all
+        selected = []
+        if prefer_same_category and category in self.category_links:
+            selected = self.sample_links(
+                self.category_links[category],
+                self.category_sets[category],
+                num_links,
+                exclude,
+                rng
+            )
+            exclude.update(selected)
+
+        # Supplement from all categories; same-category links are used up by now
         if len(selected) < num_links:
-            available = [link for cat, link in all_links if link not in selected]
-            if available:
-                needed = min(num_links - len(selected), len(available))
-                selected.extend(random.sample(available, needed))
+            selected.extend(self.sample_links(
+                self.all_links,
+                self.all_set,
+                num_links - len(selected),
+                exclude,
+                rng
+            ))
 
         return selected[:num_links]
 
@@ -0,0 +1,134 @@
+"""
+Journal Module
+Append-only, fsync'd JSONL checkpoint journal of per-article state
+transitions, used to resume an interrupted run without paying for any
+completed API call twice.
+"""
+import json
+import os
+import time
+from typing import Dict, Optional
+
+
+class RunJournal:
+    # Article states, in the order an article normally moves through them
+    QUEUED = 'queued'
+    REQUESTED = 'requested'
+    SUCCEEDED = 'succeeded'
+    VALIDATED = 'validated'
+    WRITTEN = 'written'
+    FAILED = 'failed'
+
+    def __init__(self, journal_path: str):
+        """
+        Initialize the journal.
+
+        Args:
+            journal_path: Path to the JSONL journal file
+        """
+        self.journal_path = journal_path
+        self.file = None
+        self.run_id = None
+
+    def load(self) -> Dict[str, Dict]:
+        """
+        Replay the journal into the latest known state of every article.
+
+        Content from a 'succeeded' record is carried forward through later
+        'validated' records so a crash before writing can still be recovered.
+        A torn last line from a crash mid-write is ignored.
+
+        Returns:
+            Dictionary mapping url_path to its latest record
+        """
+        states = {}
+        contents = {}
+        if not os.path.exists(self.journal_path):
+            return states
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                url_path = record.get('url_path')
+                if not url_path:
+                    continue
+
+                if record['state'] == self.SUCCEEDED and 'content' in record:
+                    contents[url_path] = record['content']
+                elif record['state'] in (self.QUEUED, self.REQUESTED):
+                    contents.pop(url_path, None)
+                states[url_path] = record
+
+        for url_path, record in states.items():
+            if record['state'] in (self.SUCCEEDED, self.VALIDATED) and url_path in contents:
+                record['content'] = contents[url_path]
+
+        return states
+
+    def start(self, resume: bool = False):
+        """
+        Open the journal for a run.
+
+        A fresh run moves any previous journal aside to '<path>.prev';
+        a resumed run keeps appending to it.
+
+        Args:
+            resume: Whether this run continues the previous one
+        """
+        os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+
+        if not resume and os.path.exists(self.journal_path):
+            os.replace(self.journal_path, self.journal_path + '.prev')
+
+        self.file = open(self.journal_path, 'a', encoding='utf-8')
+        self.run_id = time.strftime('%Y%m%d-%H%M%S')
+        self.append({'event': 'run_started', 'run_id': self.run_id, 'resume': resume})
+
+    def append(self, record: Dict):
+        """
+        Durably append one record.
+
+        Args:
+            record: JSON-serializable record
+        """
+        if self.file is None:
+            return
+
+        record.setdefault('ts', round(time.time(), 3))
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def record(
+        self,
+        state: str,
+        article_info: Dict,
+        content: Optional[str] = None,
+        reason: Optional[str] = None
+    ):
+        """
+        Record a state transition for an article.
+
+        Args:
+            state: One of the RunJournal state constants
+            article_info: Dictionary with article metadata
+            content: Generated content (stored with 'succeeded' records)
+            reason: Failure reason (stored with 'failed' records)
+        """
+        record = {'state': state, 'url_path': article_info['url_path']}
+        if content is not None:
+            record['content'] = content
+        if reason is not None:
+            record['reason'] = reason
+        self.append(record)
+
+    def close(self):
+        """Close the journal file."""
+        if self.file is not None:
+            self.append({'event': 'run_finished', 'run_id': self.run_id})
+            self.file.close()
+            self.file = None
@@ -0,0 +1,124 @@
+"""
+Manifest Module
+Tracks a hash of every generated article's input row so reruns can skip
+rows that have not changed since they were last written.
+"""
+import hashlib
+import json
+import os
+from typing import Dict
+
+
+class ArticleManifest:
+    def __init__(self, manifest_path: str, fingerprint: str):
+        """
+        Initialize the manifest.
+
+        Args:
+            manifest_path: Path to the JSON manifest file
+            fingerprint: Hash of the generation settings (model, temperature, template)
+        """
+        self.manifest_path = manifest_path
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.dirty = 0
+
+    @staticmethod
+    def build_fingerprint(model: str, temperature: float, template: str) -> str:
+        """
+        Hash the settings that affect every article's output.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            template: Prompt template text
+
+        Returns:
+            Hex digest of the settings
+        """
+        payload = json.dumps(
+            {'model': model, 'temperature': temperature, 'template': template},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def row_hash(self, article: Dict) -> str:
+        """
+        Hash one input row together with the generation settings.
+
+        Args:
+            article: Article metadata dictionary
+
+        Returns:
+            Hex digest identifying this version of the row
+        """
+        payload = json.dumps(
+            [
+                article['url_path'],
+                article['title'],
+                article['keyword'],
+                article['reference'],
+                self.fingerprint
+            ],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self) -> bool:
+        """
+        Load the manifest from disk if it exists.
+
+        Returns:
+            bool: True if an existing manifest was loaded
+        """
+        if not os.path.exists(self.manifest_path):
+            return False
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+            return True
+        except Exception as e:
+            print(f"⚠️  Could not read manifest {self.manifest_path}: {str(e)}")
+            self.entries = {}
+            return False
+
+    def save(self):
+        """Atomically write the manifest to disk."""
+        os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self.dirty = 0
+
+    def is_tracked(self, article: Dict) -> bool:
+        """Check whether the article has any manifest entry."""
+        return article['url_path'] in self.entries
+
+    def is_current(self, article: Dict) -> bool:
+        """
+        Check whether the article was generated from this exact row and settings.
+
+        Args:
+            article: Article metadata dictionary
+
+        Returns:
+            bool: True if the stored hash matches
+        """
+        return self.entries.get(article['url_path']) == self.row_hash(article)
+
+    def record(self, article: Dict, autosave_every: int = 50):
+        """
+        Record the current hash for an article, saving periodically.
+
+        Args:
+            article: Article metadata dictionary
+            autosave_every: Save to disk after this many unsaved changes
+        """
+        self.entries[article['url_path']] = self.row_hash(article)
+        self.dirty += 1
+        if self.dirty >= autosave_every:
+            self.save()
@@ -0,0 +1,251 @@
+"""
+Metrics Module
+Lightweight histograms and counters for run instrumentation, exported as
+JSON and Prometheus text-format files at the end of a run and periodically
+during it.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Latency buckets in seconds, from sub-millisecond writes to multi-minute generations
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1, 2.5, 5, 10, 20, 30, 60, 90, 120, 300
+)
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize a fixed-bucket histogram.
+
+        Args:
+            name: Metric name
+            description: Help text
+            buckets: Upper bounds of the buckets, ascending
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value (0 when empty)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if seen + bucket_count >= rank and bucket_count > 0:
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict:
+        """Summarize the histogram for JSON export."""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(list(self.buckets) + [math.inf], self.counts):
+            cumulative += bucket_count
+            buckets['+Inf' if bound == math.inf else str(bound)] = cumulative
+
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0,
+            'p50': round(self.quantile(0.50), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'buckets': buckets
+        }
+
+
+class MetricsRegistry:
+    # Histograms recorded by the pipeline, in pipeline order
+    HISTOGRAMS = {
+        'queue_wait_seconds': 'Time waiting for token budget and a request slot',
+        'connect_seconds': 'Time to open a new connection (DNS + TCP + TLS)',
+        'server_seconds': 'Time from sending the request to receiving response headers',
+        'body_read_seconds': 'Time to read the response body',
+        'prefix_cached_request_seconds': 'Request latency when the provider reused a cached prompt prefix',
+        'uncached_request_seconds': 'Request latency without a cached prompt prefix',
+        'article_latency_seconds': 'End-to-end time per article including retries',
+        'validation_seconds': 'Time to validate generated MDX',
+        'write_seconds': 'Time to write an MDX file'
+    }
+
+    def __init__(self, prefix: str = 'articles'):
+        """
+        Initialize the registry.
+
+        Args:
+            prefix: Prefix for exported metric names
+        """
+        self.prefix = prefix
+        self.histograms = {
+            name: Histogram(name, description)
+            for name, description in self.HISTOGRAMS.items()
+        }
+        self.counters = {}
+        self.collectors = []
+        self.started = time.time()
+
+    def observe(self, name: str, value: float):
+        """
+        Record a histogram observation.
+
+        Args:
+            name: Histogram name (created on first use if unknown)
+            value: Observed value
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name, name)
+        self.histograms[name].observe(value)
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1):
+        """
+        Increment a labelled counter.
+
+        Args:
+            name: Counter name
+            labels: Label values, e.g. {'status': '429'}
+            amount: Increment
+        """
+        key = tuple(sorted((labels or {}).items()))
+        series = self.counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+    def add_collector(self, collector: Callable[[], Dict[str, float]]):
+        """
+        Register a callable that returns gauge values at export time.
+
+        Args:
+            collector: Function returning {gauge_name: value}
+        """
+        self.collectors.append(collector)
+
+    def collect_gauges(self) -> Dict[str, float]:
+        """Gather current gauge values from all collectors."""
+        gauges = {'uptime_seconds': round(time.time() - self.started, 3)}
+        for collector in self.collectors:
+            for name, value in collector().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauges[name] = value
+        return gauges
+
+    def to_json(self) -> Dict:
+        """Snapshot every metric as a JSON-serializable dictionary."""
+        return {
+            'timestamp': round(time.time(), 3),
+            'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+            'counters': {
+                name: [{'labels': dict(key), 'value': value} for key, value in series.items()]
+                for name, series in self.counters.items()
+            },
+            'gauges': self.collect_gauges()
+        }
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def format_labels(pairs) -> str:
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{key}="{value}"' for key, value in pairs) + '}'
+
+        for name, histogram in self.histograms.items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {metric} {histogram.description}")
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(list(histogram.buckets) + [math.inf], histogram.counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == math.inf else repr(float(bound))
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {histogram.sum}")
+            lines.append(f"{metric}_count {histogram.count}")
+
+        for name, series in self.counters.items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in series.items():
+                lines.append(f"{metric}{format_labels(key)} {value}")
+
+        for name, value in self.collect_gauges().items():
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, json_path: Optional[str], prometheus_path: Optional[str]):
+        """
+        Atomically write the JSON and Prometheus files.
+
+        Args:
+            json_path: Destination of the JSON snapshot (skipped if None)
+            prometheus_path: Destination of the Prometheus text file (skipped if None)
+        """
+        outputs = [
+            (json_path, lambda: json.dumps(self.to_json(), indent=2)),
+            (prometheus_path, self.to_prometheus)
+        ]
+        for path, render in outputs:
+            if not path:
+                continue
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(render())
+            os.replace(tmp_path, path)
+
+    async def export_periodically(
+        self,
+        interval: float,
+        json_path: Optional[str],
+        prometheus_path: Optional[str]
+    ):
+        """
+        Export every `interval` seconds until cancelled.
+
+        Args:
+            interval: Seconds between exports
+            json_path: Destination of the JSON snapshot
+            prometheus_path: Destination of the Prometheus text file
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.export(json_path, prometheus_path)
+            except OSError as e:
+                print(f"⚠️  Could not export metrics: {str(e)}")
@@ -0,0 +1,518 @@
+"""
+Mock Server Module
+Local OpenAI-compatible stand-in for the chat completions endpoint, used to
+load-test APIClient without spending real tokens.
+
+Supports configurable latency distributions, 429/4xx/5xx injection, truncated
+or invalid MDX bodies, SSE streaming responses, prompt-prefix caching and the
+/v1/files and /v1/batches endpoints of the Batch API.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Dict, Optional
+
+from aiohttp import web
+
+from token_budget import estimate_tokens
+
+
+DEFAULT_SETTINGS = {
+    'latency': 'lognormal',     # 'fixed', 'uniform' or 'lognormal'
+    'latency_median': 0.2,      # seconds (fixed value / lognormal median)
+    'latency_sigma': 0.5,       # lognormal shape
+    'latency_min': 0.05,        # uniform lower bound
+    'latency_max': 0.5,         # uniform upper bound
+    'rate_429': 0.0,            # fraction of requests answered with 429
+    'rate_limit_rps': 0,        # enforce a real requests/second quota (0 = off)
+    'rate_5xx': 0.0,            # fraction of requests answered with 500/502/503
+    'rate_4xx': 0.0,            # fraction answered with a non-retryable 400
+    'rate_truncated': 0.0,      # fraction cut off with finish_reason "length"
+    'rate_invalid': 0.0,        # fraction returned without YAML front matter
+    'retry_after': 1,           # Retry-After seconds sent with 429s
+    'body_words': 300,          # words in each generated article
+    'stream_chunks': 20,        # SSE chunks per streamed response
+    'batch_latency': 2.0,       # seconds a batch stays in progress
+    'prefix_cache': True,       # report cached_tokens for repeated prompt prefixes
+    'prefix_cache_min_tokens': 1024,  # shortest prompt eligible for prefix caching
+    'prefix_cache_speedup': 0.3,      # latency saved when the whole prompt is cached
+    'seed': None
+}
+
+
+class MockAPIServer:
+    def __init__(self, settings: Optional[Dict] = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the mock server.
+
+        Args:
+            settings: Overrides for DEFAULT_SETTINGS
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.settings.update(settings or {})
+        self.host = host
+        self.port = port
+        self.runner = None
+        self.random = random.Random(self.settings['seed'])
+        self.quota_tokens = float(self.settings['rate_limit_rps'])
+        self.quota_refilled = time.monotonic()
+        self.files = {}
+        self.batches = {}
+        self.seen_prefixes = set()
+
+        self.stats = {
+            'requests': 0,
+            'responses_200': 0,
+            'responses_429': 0,
+            'responses_5xx': 0,
+            'responses_4xx': 0,
+            'truncated': 0,
+            'continuations': 0,
+            'invalid': 0,
+            'streamed': 0,
+            'client_aborts': 0,
+            'batches': 0,
+            'batch_requests': 0,
+            'cached_tokens': 0
+        }
+
+    @property
+    def url(self) -> str:
+        """Chat completions URL of the running server."""
+        return f"http://{self.host}:{self.port}/v1/chat/completions"
+
+    def build_app(self) -> web.Application:
+        """Create the aiohttp application with all mock routes."""
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self.handle_chat)
+        app.router.add_get('/v1/models', self.handle_models)
+        app.router.add_post('/v1/files', self.handle_upload_file)
+        app.router.add_get('/v1/files/{file_id}/content', self.handle_file_content)
+        app.router.add_post('/v1/batches', self.handle_create_batch)
+        app.router.add_get('/v1/batches/{batch_id}', self.handle_get_batch)
+        return app
+
+    async def start(self):
+        """Start serving in the current event loop."""
+        self.runner = web.AppRunner(self.build_app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        # Resolve the real port when 0 was requested
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop the server."""
+        for batch in self.batches.values():
+            task = batch.pop('_task', None)
+            if task:
+                task.cancel()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    def over_quota(self) -> bool:
+        """Consume one request from the requests/second quota, if one is enforced."""
+        rps = self.settings['rate_limit_rps']
+        if not rps:
+            return False
+
+        now = time.monotonic()
+        self.quota_tokens = min(float(rps), self.quota_tokens + (now - self.quota_refilled) * rps)
+        self.quota_refilled = now
+        if self.quota_tokens < 1:
+            return True
+        self.quota_tokens -= 1
+        return False
+
+    def sample_latency(self) -> float:
+        """Draw one response latency from the configured distribution."""
+        settings = self.settings
+        if settings['latency'] == 'fixed':
+            return settings['latency_median']
+        if settings['latency'] == 'uniform':
+            return self.random.uniform(settings['latency_min'], settings['latency_max'])
+        return settings['latency_median'] * math.exp(self.random.gauss(0, settings['latency_sigma']))
+
+    def build_article(self, title: str) -> str:
+        """Build a valid MDX article with front matter."""
+        words = ' '.join(
+            self.random.choice(['wind', 'blade', 'jianghu', 'boss', 'quest', 'guide', 'martial', 'arts'])
+            for _ in range(self.settings['body_words'])
+        )
+        return (
+            "---\n"
+            f"title: \"{title}\"\n"
+            "description: \"Mock article generated by the local stand-in server\"\n"
+            "keywords: [\"mock\", \"benchmark\"]\n"
+            "canonical: \"https://example.com/mock/\"\n"
+            "date: \"2025-01-01\"\n"
+            "---\n\n"
+            "## Overview\n\n"
+            f"{words}\n"
+        )
+
+    def cached_prefix_tokens(self, prompt: str) -> int:
+        """
+        Emulate provider prompt caching: the longest previously seen prefix
+        counts as cached, rounded down to 128-token blocks, once the prompt is
+        long enough to be eligible.
+
+        Args:
+            prompt: Concatenated message contents
+
+        Returns:
+            Cached prompt tokens
+        """
+        if not self.settings['prefix_cache']:
+            return 0
+
+        chunk_chars = 128
+        digest = hashlib.sha1()
+        matched_chars = 0
+        matching = True
+        for start in range(0, len(prompt) - chunk_chars + 1, chunk_chars):
+            digest.update(prompt[start:start + chunk_chars].encode('utf-8'))
+            key = digest.hexdigest()
+            if matching and key in self.seen_prefixes:
+                matched_chars = start + chunk_chars
+            else:
+                matching = False
+                self.seen_prefixes.add(key)
+
+        if estimate_tokens(prompt) < self.settings['prefix_cache_min_tokens']:
+            return 0
+        return estimate_tokens(prompt[:matched_chars]) // 128 * 128
+
+    def build_choice(self, body: Dict, continuation: bool) -> tuple:
+        """
+        Pick the outcome for one candidate.
+
+        Args:
+            body: Request JSON
+            continuation: Whether the request continues a truncated output
+
+        Returns:
+            Tuple of (content, finish_reason)
+        """
+        content = self.build_article("Mock Article")
+        finish_reason = 'stop'
+
+        if continuation:
+            content = content[len(content) // 2:]
+
+        roll = self.random.random()
+        if roll < self.settings['rate_truncated']:
+            content = content[:len(content) // 2]
+            finish_reason = 'length'
+            self.stats['truncated'] += 1
+        elif not continuation and roll < self.settings['rate_truncated'] + self.settings['rate_invalid']:
+            content = "```mdx\n" + content + "```\n"
+            self.stats['invalid'] += 1
+
+        # Honour the request's completion limit like the real API
+        max_tokens = body.get('max_tokens')
+        if max_tokens and len(content) // 4 > max_tokens and finish_reason != 'length':
+            content = content[:max_tokens * 4]
+            finish_reason = 'length'
+            self.stats['truncated'] += 1
+
+        return content, finish_reason
+
+    def build_completion(self, body: Dict) -> tuple:
+        """
+        Pick the outcome for one request.
+
+        Args:
+            body: Request JSON
+
+        Returns:
+            Tuple of (list of (content, finish_reason) per candidate, usage)
+        """
+        messages = body.get('messages', [])
+        prompt = ''.join(message.get('content', '') for message in messages)
+
+        # A continuation request carries the truncated output as an assistant turn
+        continuation = any(message.get('role') == 'assistant' for message in messages)
+        if continuation:
+            self.stats['continuations'] += 1
+
+        # n candidates share one prompt
+        choices = [self.build_choice(body, continuation) for _ in range(max(1, body.get('n', 1)))]
+
+        prompt_tokens = max(1, estimate_tokens(prompt))
+        completion_tokens = sum(max(1, len(content) // 4) for content, _ in choices)
+        cached_tokens = self.cached_prefix_tokens(prompt)
+        self.stats['cached_tokens'] += cached_tokens
+        usage = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'prompt_tokens_details': {'cached_tokens': cached_tokens}
+        }
+        return choices, usage
+
+    @staticmethod
+    def format_choices(choices: list) -> list:
+        """Format (content, finish_reason) tuples as chat completion choices."""
+        return [
+            {
+                'index': index,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': finish_reason
+            }
+            for index, (content, finish_reason) in enumerate(choices)
+        ]
+
+    async def handle_models(self, request: web.Request) -> web.Response:
+        """Answer GET /v1/models (cheap request for connection warm-up)."""
+        return web.json_response({'object': 'list', 'data': [{'id': 'gpt-4o', 'object': 'model'}]})
+
+    async def handle_chat(self, request: web.Request) -> web.StreamResponse:
+        """Answer POST /v1/chat/completions."""
+        self.stats['requests'] += 1
+        body = await request.json()
+        latency = self.sample_latency()
+
+        roll = self.random.random()
+        if self.over_quota() or roll < self.settings['rate_429']:
+            self.stats['responses_429'] += 1
+            await asyncio.sleep(min(latency, 0.05))
+            return web.json_response(
+                {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_exceeded'}},
+                status=429,
+                headers={'Retry-After': str(self.settings['retry_after'])}
+            )
+        if roll < self.settings['rate_429'] + self.settings['rate_5xx']:
+            self.stats['responses_5xx'] += 1
+            await asyncio.sleep(latency / 2)
+            return web.json_response(
+                {'error': {'message': 'Upstream error', 'type': 'server_error'}},
+                status=self.random.choice([500, 502, 503])
+            )
+        if roll < self.settings['rate_429'] + self.settings['rate_5xx'] + self.settings['rate_4xx']:
+            self.stats['responses_4xx'] += 1
+            await asyncio.sleep(min(latency, 0.05))
+            return web.json_response(
+                {'error': {
+                    'message': "This model's maximum context length is 128000 tokens",
+                    'type': 'invalid_request_error',
+                    'code': 'context_length_exceeded'
+                }},
+                status=400
+            )
+
+        choices, usage = self.build_completion(body)
+        self.stats['responses_200'] += 1
+        # A cached prefix skips part of the prefill
+        cached_share = usage['prompt_tokens_details']['cached_tokens'] / usage['prompt_tokens']
+        latency *= 1 - self.settings['prefix_cache_speedup'] * cached_share
+
+        if body.get('stream'):
+            return await self.stream_completion(request, body, choices, usage, latency)
+
+        await asyncio.sleep(latency)
+        return web.json_response({
+            'id': f"chatcmpl-mock-{self.stats['requests']}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o'),
+            'choices': self.format_choices(choices),
+            'usage': usage
+        })
+
+    async def stream_completion(
+        self,
+        request: web.Request,
+        body: Dict,
+        choices: list,
+        usage: Dict,
+        latency: float
+    ) -> web.StreamResponse:
+        """Send the completion as server-sent events."""
+        self.stats['streamed'] += 1
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+
+        # Candidates are interleaved chunk by chunk, as the real API does with n > 1
+        chunks = max(1, self.settings['stream_chunks'])
+        pieces = []
+        for choice_index, (content, finish_reason) in enumerate(choices):
+            size = max(1, math.ceil(len(content) / chunks))
+            split = [content[i:i + size] for i in range(0, len(content), size)] or ['']
+            for position, piece in enumerate(split):
+                pieces.append((position, choice_index, piece, finish_reason if position == len(split) - 1 else None))
+        pieces.sort(key=lambda item: (item[0], item[1]))
+
+        async def send(payload: Dict):
+            await response.write(f"data: {json.dumps(payload)}\n\n".encode('utf-8'))
+
+        try:
+            # Roughly a third of the latency is time to first token
+            await asyncio.sleep(latency / 3)
+            for _, choice_index, piece, finish_reason in pieces:
+                await send({
+                    'object': 'chat.completion.chunk',
+                    'choices': [{
+                        'index': choice_index,
+                        'delta': {'content': piece},
+                        'finish_reason': finish_reason
+                    }]
+                })
+                await asyncio.sleep(latency * 2 / 3 / len(pieces))
+
+            if body.get('stream_options', {}).get('include_usage'):
+                await send({'object': 'chat.completion.chunk', 'choices': [], 'usage': usage})
+
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client aborted the stream early
+            self.stats['client_aborts'] += 1
+
+        return response
+
+
+    async def handle_upload_file(self, request: web.Request) -> web.Response:
+        """Answer POST /v1/files (multipart upload of a batch input file)."""
+        form = await request.post()
+        upload = form.get('file')
+        if upload is None or not hasattr(upload, 'file'):
+            return web.json_response({'error': {'message': "Missing 'file'"}}, status=400)
+
+        file_id = f"file-mock-{len(self.files) + 1}"
+        self.files[file_id] = upload.file.read()
+        return web.json_response({
+            'id': file_id,
+            'object': 'file',
+            'bytes': len(self.files[file_id]),
+            'filename': upload.filename,
+            'purpose': form.get('purpose', 'batch')
+        })
+
+    async def handle_file_content(self, request: web.Request) -> web.Response:
+        """Answer GET /v1/files/{file_id}/content."""
+        content = self.files.get(request.match_info['file_id'])
+        if content is None:
+            return web.json_response({'error': {'message': 'No such file'}}, status=404)
+        return web.Response(body=content, content_type='application/jsonl')
+
+    async def handle_create_batch(self, request: web.Request) -> web.Response:
+        """Answer POST /v1/batches and process the batch in the background."""
+        body = await request.json()
+        if body.get('input_file_id') not in self.files:
+            return web.json_response({'error': {'message': 'No such input file'}}, status=400)
+
+        self.stats['batches'] += 1
+        batch_id = f"batch_mock_{self.stats['batches']}"
+        batch = {
+            'id': batch_id,
+            'object': 'batch',
+            'endpoint': body.get('endpoint'),
+            'input_file_id': body['input_file_id'],
+            'completion_window': body.get('completion_window', '24h'),
+            'status': 'validating',
+            'created_at': int(time.time()),
+            'output_file_id': None,
+            'error_file_id': None,
+            'request_counts': {'total': 0, 'completed': 0, 'failed': 0}
+        }
+        self.batches[batch_id] = batch
+        batch['_task'] = asyncio.create_task(self.process_batch(batch))
+        return web.json_response(self.public_batch(batch))
+
+    async def handle_get_batch(self, request: web.Request) -> web.Response:
+        """Answer GET /v1/batches/{batch_id}."""
+        batch = self.batches.get(request.match_info['batch_id'])
+        if batch is None:
+            return web.json_response({'error': {'message': 'No such batch'}}, status=404)
+        return web.json_response(self.public_batch(batch))
+
+    @staticmethod
+    def public_batch(batch: Dict) -> Dict:
+        """Batch object without internal fields."""
+        return {key: value for key, value in batch.items() if not key.startswith('_')}
+
+    async def process_batch(self, batch: Dict):
+        """Generate every request of a batch and write the output and error files."""
+        lines = [
+            json.loads(line)
+            for line in self.files[batch['input_file_id']].decode('utf-8').splitlines()
+            if line.strip()
+        ]
+        batch['request_counts']['total'] = len(lines)
+        batch['status'] = 'in_progress'
+        await asyncio.sleep(self.settings['batch_latency'])
+
+        outputs = []
+        errors = []
+        for line in lines:
+            self.stats['batch_requests'] += 1
+            if self.random.random() < self.settings['rate_5xx']:
+                batch['request_counts']['failed'] += 1
+                errors.append({
+                    'id': f"batch_req_{self.stats['batch_requests']}",
+                    'custom_id': line['custom_id'],
+                    'response': {
+                        'status_code': 500,
+                        'body': {'error': {'message': 'Upstream error', 'type': 'server_error'}}
+                    },
+                    'error': None
+                })
+                continue
+
+            choices, usage = self.build_completion(line['body'])
+            batch['request_counts']['completed'] += 1
+            outputs.append({
+                'id': f"batch_req_{self.stats['batch_requests']}",
+                'custom_id': line['custom_id'],
+                'response': {
+                    'status_code': 200,
+                    'body': {
+                        'object': 'chat.completion',
+                        'model': line['body'].get('model', 'gpt-4o'),
+                        'choices': self.format_choices(choices),
+                        'usage': usage
+                    }
+                },
+                'error': None
+            })
+
+        for key, records in (('output_file_id', outputs), ('error_file_id', errors)):
+            if records:
+                file_id = f"file-mock-{len(self.files) + 1}"
+                self.files[file_id] = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+                batch[key] = file_id
+
+        batch['status'] = 'completed'
+        batch['completed_at'] = int(time.time())
+
+
+if __name__ == "__main__":
+    # Run the mock server in the foreground
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible mock server')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--settings', type=str, default='{}', help='JSON overrides for DEFAULT_SETTINGS')
+    args = parser.parse_args()
+
+    async def serve():
+        server = MockAPIServer(json.loads(args.settings), port=args.port)
+        await server.start()
+        print(f"✅ Mock server listening on {server.url}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,268 @@
+"""
+Rate Controller Module
+Shared AIMD (additive-increase / multiplicative-decrease) controller that
+adapts request concurrency and request rate to the provider's rate limits.
+"""
+import asyncio
+import collections
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit duration header into seconds.
+
+    Accepts plain seconds ("2", "0.5") and Go-style durations used by
+    OpenAI-compatible providers ("20ms", "1s", "6m0s", "1h2m3.5s").
+
+    Args:
+        value: Header value
+
+    Returns:
+        Duration in seconds, or None if it cannot be parsed
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts or ''.join(number + unit for number, unit in parts) != value:
+        return None
+
+    scale = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+    return sum(float(number) * scale[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Extract the server's suggested wait time from response headers.
+
+    Checks retry-after-ms, Retry-After (seconds or HTTP date) and the
+    x-ratelimit-reset-* headers, in that order.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Seconds to wait, or None if the server gave no hint
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get('Retry-After')
+    if retry_after is not None:
+        seconds = parse_duration(retry_after)
+        if seconds is not None:
+            return seconds
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    resets = [
+        parse_duration(headers.get(name))
+        for name in ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens')
+    ]
+    resets = [seconds for seconds in resets if seconds is not None]
+    return max(resets) if resets else None
+
+
+class RateController:
+    def __init__(self, max_concurrency: int, config: Optional[Dict] = None):
+        """
+        Initialize the rate controller.
+
+        Args:
+            max_concurrency: Upper bound on requests in flight (the dispatch window)
+            config: Optional 'rate_control' settings from config.json
+        """
+        config = config or {}
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, config.get('min_concurrency', 1))
+        self.concurrency_limit = float(min(
+            self.max_concurrency,
+            config.get('initial_concurrency', self.max_concurrency)
+        ))
+        self.additive_increase = config.get('additive_increase', 1.0)
+        self.decrease_factor = config.get('decrease_factor', 0.5)
+        self.min_rate = config.get('min_rate', 0.5)
+        self.max_rate = config.get('max_rate')
+        self.rate_increase = config.get('rate_increase', 1.0)
+        self.default_backoff = config.get('default_backoff', 5.0)
+
+        # None means requests are not paced until the first rate limit
+        self.rate = config.get('initial_rate')
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.next_send_time = 0.0
+        self.last_decrease = 0.0
+        self.recent_starts = collections.deque()
+        self.slot_freed = asyncio.Event()
+
+        self.stats = {
+            'rate_limited': 0,
+            'decreases': 0,
+            'pauses': 0,
+            'min_concurrency_seen': self.concurrency_limit
+        }
+
+    def observed_rate(self, window: float = 10.0) -> float:
+        """Requests started per second over the last `window` seconds."""
+        now = time.monotonic()
+        while self.recent_starts and now - self.recent_starts[0] > window:
+            self.recent_starts.popleft()
+        if not self.recent_starts:
+            return 0.0
+        return len(self.recent_starts) / max(1.0, now - self.recent_starts[0])
+
+    def has_capacity(self) -> bool:
+        """Check whether acquire() would get a slot right away (pacing aside)."""
+        return (
+            time.monotonic() >= self.paused_until and
+            self.in_flight < max(self.min_concurrency, int(self.concurrency_limit))
+        )
+
+    async def acquire(self):
+        """Wait for a free concurrency slot, any global pause and the pacing interval."""
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            if self.in_flight < max(self.min_concurrency, int(self.concurrency_limit)):
+                break
+            self.slot_freed.clear()
+            await self.slot_freed.wait()
+
+        self.in_flight += 1
+        self.recent_starts.append(now)
+
+        if self.rate:
+            send_at = max(now, self.next_send_time)
+            self.next_send_time = send_at + 1.0 / self.rate
+            if send_at > now:
+                await asyncio.sleep(send_at - now)
+
+    def release(self):
+        """Return a concurrency slot."""
+        self.in_flight -= 1
+        self.slot_freed.set()
+
+    def on_success(self, headers: Optional[Mapping[str, str]] = None):
+        """
+        Additively grow concurrency and rate after a successful call.
+
+        Increments are divided by the current value, so the limit grows by
+        roughly `additive_increase` per full window of successes.
+
+        Args:
+            headers: Response headers (used to honor exhausted quotas)
+        """
+        self.concurrency_limit = min(
+            float(self.max_concurrency),
+            self.concurrency_limit + self.additive_increase / max(1.0, self.concurrency_limit)
+        )
+
+        if self.rate:
+            self.rate += self.rate_increase / max(1.0, self.rate)
+            if self.max_rate:
+                self.rate = min(self.rate, self.max_rate)
+
+        if headers:
+            self.apply_quota_headers(headers)
+
+    def on_rate_limited(self, headers: Optional[Mapping[str, str]] = None):
+        """
+        Multiplicatively cut concurrency and rate after a 429 and pause all requests.
+
+        Cuts happen at most once per pause window so that a burst of 429s
+        from requests that were already in flight counts as one event.
+
+        Args:
+            headers: Response headers with Retry-After / x-ratelimit-* hints
+        """
+        now = time.monotonic()
+        self.stats['rate_limited'] += 1
+
+        wait = parse_retry_after(headers)
+        if wait is None:
+            wait = self.default_backoff
+
+        if now >= self.last_decrease + max(wait, 1.0):
+            self.last_decrease = now
+            self.stats['decreases'] += 1
+            self.concurrency_limit = max(
+                float(self.min_concurrency),
+                self.concurrency_limit * self.decrease_factor
+            )
+            current_rate = self.rate or self.observed_rate() or float(self.max_concurrency)
+            self.rate = max(self.min_rate, current_rate * self.decrease_factor)
+            self.stats['min_concurrency_seen'] = min(
+                self.stats['min_concurrency_seen'],
+                self.concurrency_limit
+            )
+
+        self.pause(wait)
+
+    def apply_quota_headers(self, headers: Mapping[str, str]):
+        """
+        Use x-ratelimit-* headers to cap the rate and pause before a quota runs out.
+
+        Args:
+            headers: Response headers
+        """
+        limit = headers.get('x-ratelimit-limit-requests')
+        if limit is not None:
+            try:
+                per_second = float(limit) / 60
+                self.max_rate = min(self.max_rate, per_second) if self.max_rate else per_second
+                if self.rate:
+                    self.rate = min(self.rate, self.max_rate)
+            except ValueError:
+                pass
+
+        remaining = headers.get('x-ratelimit-remaining-requests')
+        if remaining is not None and remaining.strip() == '0':
+            reset = parse_duration(headers.get('x-ratelimit-reset-requests'))
+            self.pause(reset if reset is not None else self.default_backoff)
+
+    def pause(self, seconds: float):
+        """
+        Hold back every new request for `seconds`.
+
+        Args:
+            seconds: Pause length
+        """
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_until = until
+            self.stats['pauses'] += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Get controller statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.stats.copy()
+        stats['concurrency_limit'] = round(self.concurrency_limit, 2)
+        stats['min_concurrency_seen'] = round(stats['min_concurrency_seen'], 2)
+        stats['rate'] = round(self.rate, 2) if self.rate else None
+        return stats
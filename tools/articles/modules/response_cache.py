@@ -0,0 +1,187 @@
+"""
+Response Cache Module
+Persistent, content-addressed cache of API responses stored in SQLite, so
+reruns with identical prompts replay earlier generations instead of paying
+for them again.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_path: str,
+        max_entries: int = 20000,
+        max_size_mb: float = 500,
+        max_age_days: float = 30
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+            max_entries: Maximum number of cached responses (0 = unlimited)
+            max_size_mb: Maximum total size of cached content (0 = unlimited)
+            max_age_days: Entries older than this are evicted (0 = never)
+        """
+        self.cache_path = cache_path
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 86400
+        self.puts_since_evict = 0
+
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(cache_path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                total_tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses (last_used)")
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evicted': 0,
+            'saved_tokens': 0
+        }
+
+        self.evict()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        system_message: str,
+        prompt: str
+    ) -> str:
+        """
+        Build the content address of a request.
+
+        Args:
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            system_message: System message text
+            prompt: User prompt text
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [model, temperature, max_tokens, system_message, prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Request key from make_key()
+
+        Returns:
+            Cached content, or None on a miss
+        """
+        row = self.db.execute(
+            "SELECT content, total_tokens, created_at FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        now = time.time()
+        if row is None or (self.max_age_seconds and now - row[2] > self.max_age_seconds):
+            self.stats['misses'] += 1
+            return None
+
+        self.db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.stats['hits'] += 1
+        self.stats['saved_tokens'] += row[1]
+        return row[0]
+
+    def put(self, key: str, content: str, total_tokens: int = 0):
+        """
+        Store a response, evicting old entries periodically.
+
+        Args:
+            key: Request key from make_key()
+            content: Generated content
+            total_tokens: Tokens the response cost (reported as savings on hits)
+        """
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses "
+            "(key, content, size, total_tokens, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, content, len(content.encode('utf-8')), total_tokens, now, now)
+        )
+        self.stats['stores'] += 1
+
+        self.puts_since_evict += 1
+        if self.puts_since_evict >= 100:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones beyond the size/count limits."""
+        self.puts_since_evict = 0
+        evicted = 0
+
+        if self.max_age_seconds:
+            cursor = self.db.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,)
+            )
+            evicted += cursor.rowcount
+
+        count, total_size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+        if (self.max_entries and count > self.max_entries) or (self.max_bytes and total_size > self.max_bytes):
+            to_delete = []
+            rows = self.db.execute("SELECT key, size FROM responses ORDER BY last_used ASC")
+            for key, size in rows:
+                over_count = self.max_entries and count > self.max_entries
+                over_size = self.max_bytes and total_size > self.max_bytes
+                if not (over_count or over_size):
+                    break
+                to_delete.append((key,))
+                count -= 1
+                total_size -= size
+
+            self.db.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+            evicted += len(to_delete)
+
+        self.stats['evicted'] += evicted
+
+    def close(self):
+        """Close the database connection."""
+        self.db.close()
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.stats.copy()
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups > 0 else 0
+        stats['entries'] = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
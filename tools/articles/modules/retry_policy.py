@@ -0,0 +1,254 @@
+"""
+Retry Policy Module
+Classifies request failures as retryable or fatal, spaces retries with
+decorrelated-jitter exponential backoff inside a per-article deadline, and
+trips a shared circuit breaker when the error rate spikes.
+"""
+import asyncio
+import collections
+import random
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+
+# Outcome classes of one attempt
+RETRYABLE = 'retryable'
+RATE_LIMITED = 'rate_limited'
+# Output aborted mid-stream by validation: the provider is fine, resend at once
+REJECTED = 'rejected'
+# Attempt not sent: the article's deadline ran out while it was queued
+DEADLINE = 'deadline'
+FATAL = 'fatal'
+
+# Statuses worth another attempt; every other 4xx fails the article immediately
+RETRYABLE_STATUSES = {408, 409, 425, 500, 502, 503, 504, 520, 522, 524, 529}
+
+# 429 bodies that mean the account is out of credit rather than temporarily throttled
+FATAL_RATE_LIMIT_MARKERS = ('insufficient_quota', 'billing', 'exceeded your current quota')
+
+
+class RetryPolicy:
+    def __init__(self, retry_attempts: int = 3, retry_delay: float = 2, config: Optional[Dict] = None):
+        """
+        Initialize the retry policy.
+
+        Args:
+            retry_attempts: Maximum attempts per article
+            retry_delay: Base backoff delay in seconds
+            config: Optional 'retry' settings from config.json
+        """
+        config = config or {}
+
+        self.max_attempts = max(1, retry_attempts)
+        self.base_delay = max(0.0, retry_delay)
+        self.max_delay = config.get('max_delay', 60)
+        self.deadline = config.get('deadline_seconds', 600) or None
+        # Attempts with less time than this left before the deadline are not sent
+        self.min_attempt_seconds = config.get('min_attempt_seconds', 1.0)
+        self.random = random.Random()
+
+    def classify_status(self, status: int, body: str = '') -> str:
+        """
+        Classify a non-200 response.
+
+        Args:
+            status: HTTP status code
+            body: Response body text
+
+        Returns:
+            RETRYABLE, RATE_LIMITED or FATAL
+        """
+        if status == 429:
+            lowered = body.lower()
+            if any(marker in lowered for marker in FATAL_RATE_LIMIT_MARKERS):
+                return FATAL
+            return RATE_LIMITED
+        if status in RETRYABLE_STATUSES or status >= 500:
+            return RETRYABLE
+        # 400 (e.g. context length exceeded), 401, 403, 404, 422: the same request fails again
+        return FATAL
+
+    def classify_exception(self, error: BaseException) -> str:
+        """
+        Classify an exception raised while sending or reading a request.
+
+        Timeouts, connection and payload errors and unparseable responses
+        are transient; anything else is a bug or a bad request and is fatal.
+
+        Args:
+            error: Raised exception
+
+        Returns:
+            RETRYABLE or FATAL
+        """
+        transient = (
+            asyncio.TimeoutError,
+            aiohttp.ClientError,
+            ConnectionError,
+            ValueError,  # includes JSON decode errors
+            KeyError,
+            IndexError
+        )
+        return RETRYABLE if isinstance(error, transient) else FATAL
+
+    def next_delay(self, previous: Optional[float]) -> float:
+        """
+        Decorrelated-jitter backoff: a random delay between the base and three
+        times the previous delay, capped at max_delay. Retries from many
+        coroutines spread out instead of hitting the provider in lockstep.
+
+        Args:
+            previous: Previous delay (None before the first retry)
+
+        Returns:
+            Seconds to wait before the next attempt
+        """
+        if not self.base_delay:
+            return 0.0
+        previous = previous or self.base_delay
+        return min(self.max_delay, self.random.uniform(self.base_delay, previous * 3))
+
+    def remaining(self, started: float) -> Optional[float]:
+        """
+        Seconds left before the per-article deadline.
+
+        Args:
+            started: perf_counter() value when the article was picked up
+
+        Returns:
+            Remaining seconds, or None if no deadline is configured
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.perf_counter() - started)
+
+
+class CircuitBreaker:
+    # Breaker states
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            config: Optional 'retry.circuit_breaker' settings from config.json
+        """
+        config = config or {}
+
+        self.enabled = config.get('enabled', True)
+        self.window_seconds = config.get('window_seconds', 30)
+        self.min_requests = config.get('min_requests', 20)
+        self.failure_threshold = config.get('failure_threshold', 0.5)
+        self.open_seconds = config.get('open_seconds', 30)
+
+        self.state = self.CLOSED
+        self.opened_until = 0.0
+        self.probe = None  # Token of the half-open probe request in flight
+        self.outcomes = collections.deque()
+        self.state_changed = asyncio.Event()
+
+        self.stats = {
+            'trips': 0,
+            'open_seconds_total': 0.0
+        }
+
+    async def before_request(self) -> Optional[object]:
+        """
+        Wait until a request may be sent.
+
+        While open, every request waits. Once the open period ends, a single
+        probe request is let through; the rest wait for its outcome.
+
+        Returns:
+            A probe token if this request is the half-open probe, else None
+            (pass it back to record() with the request's outcome)
+        """
+        while self.enabled:
+            if self.state == self.CLOSED:
+                return None
+
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now < self.opened_until:
+                    await asyncio.sleep(self.opened_until - now)
+                    continue
+                self.state = self.HALF_OPEN
+                self.probe = None
+
+            if self.probe is None:
+                self.probe = object()
+                return self.probe
+
+            self.state_changed.clear()
+            await self.state_changed.wait()
+        return None
+
+    def record(self, outcome: Optional[bool], probe: Optional[object] = None):
+        """
+        Record the outcome of one attempt.
+
+        While the breaker is not closed, only the probe's outcome counts:
+        responses to requests sent before it opened arrive late and say
+        nothing about whether the provider has recovered.
+
+        Args:
+            outcome: True for success, False for a retryable failure (timeout,
+                5xx, connection error), None for outcomes that say nothing
+                about provider health (429, fatal 4xx, cancellation)
+            probe: Token returned by before_request() for this attempt
+        """
+        if not self.enabled:
+            return
+
+        now = time.monotonic()
+
+        if self.state != self.CLOSED:
+            if probe is None or probe is not self.probe:
+                return
+            self.probe = None
+            if outcome is True:
+                self.state = self.CLOSED
+                self.outcomes.clear()
+                print("✅ Circuit breaker closed, provider is healthy again")
+            elif outcome is False:
+                self.trip(now)
+            self.state_changed.set()
+            return
+
+        if outcome is None:
+            return
+
+        self.outcomes.append((now, outcome))
+        while self.outcomes and now - self.outcomes[0][0] > self.window_seconds:
+            self.outcomes.popleft()
+
+        if self.state == self.CLOSED and len(self.outcomes) >= self.min_requests:
+            failures = sum(1 for _, succeeded in self.outcomes if not succeeded)
+            if failures / len(self.outcomes) >= self.failure_threshold:
+                print(f"🔌 Circuit breaker opened: {failures}/{len(self.outcomes)} recent requests failed, "
+                      f"pausing dispatch for {self.open_seconds}s")
+                self.trip(now)
+
+    def trip(self, now: float):
+        """Open the breaker for open_seconds."""
+        self.state = self.OPEN
+        self.opened_until = now + self.open_seconds
+        self.outcomes.clear()
+        self.stats['trips'] += 1
+        self.stats['open_seconds_total'] += self.open_seconds
+
+    def get_stats(self) -> Dict:
+        """
+        Get breaker statistics.
+
+        Returns:
+            Dictionary with statistics
+        """
+        stats = self.stats.copy()
+        stats['state'] = self.state
+        return stats
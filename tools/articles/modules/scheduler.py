@@ -0,0 +1,131 @@
+"""
+Scheduler Module
+Priority queue that feeds the request window highest-priority articles first,
+with an optional time budget after which lower-priority work is deferred.
+
+Rows are pulled from the input lazily, at most `lookahead` ahead of the
+request window, so memory and pre-dispatch work stay bounded. The trade-off:
+on inputs longer than the lookahead, priority order is only exact within it.
+"""
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+
+class PriorityScheduler:
+    def __init__(self, time_budget: Optional[float] = None, lookahead: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            time_budget: Seconds after start() during which every priority is
+                dispatched, after which only the top priority tier still is
+                (None disables the budget)
+            lookahead: Most articles held for ordering at once (None or 0 reads
+                the whole input first; 1 dispatches in input order)
+        """
+        self.time_budget = time_budget
+        self.lookahead = lookahead or None
+        self.source = None
+        self.heap = []
+        self.sequence = itertools.count()
+        self.deadline = None
+        self.top_priority = math.inf
+        self.deferred = {}
+
+    @staticmethod
+    def priority_of(article: Dict) -> float:
+        """Get an article's priority (rows without one sort last)."""
+        priority = article.get('priority')
+        return math.inf if priority is None else priority
+
+    def push(self, article: Dict):
+        """
+        Queue an article.
+
+        Args:
+            article: Article metadata dictionary
+        """
+        priority = self.priority_of(article)
+        self.top_priority = min(self.top_priority, priority)
+        # The sequence number keeps sheet order within a priority and avoids comparing dicts
+        heapq.heappush(self.heap, (priority, next(self.sequence), article))
+
+    def extend(self, articles: Iterable[Dict]):
+        """Queue several articles."""
+        for article in articles:
+            self.push(article)
+
+    def feed(self, articles: Iterable[Dict]):
+        """
+        Set the article source, read lazily as the lookahead needs rows.
+
+        Args:
+            articles: Iterable (may be a generator) of article metadata dictionaries
+        """
+        self.source = iter(articles)
+
+    def fill(self):
+        """Pull articles from the source until the lookahead is full or the source ends."""
+        while self.source is not None and (self.lookahead is None or len(self.heap) < self.lookahead):
+            article = next(self.source, None)
+            if article is None:
+                self.source = None
+                return
+            self.push(article)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every article of the source has been read."""
+        return self.source is None
+
+    def start(self):
+        """Start the time budget clock."""
+        if self.time_budget is not None:
+            self.deadline = time.monotonic() + self.time_budget
+
+    def budget_exhausted(self) -> bool:
+        """Check whether the time budget has run out."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """
+        Pop articles in priority order as request slots free up.
+
+        Once the budget is exhausted, the top priority tier is still
+        dispatched and every lower-priority article is recorded as deferred.
+        """
+        if self.deadline is None:
+            self.start()
+
+        while True:
+            self.fill()
+            if not self.heap:
+                return
+            priority, _, article = heapq.heappop(self.heap)
+
+            if self.budget_exhausted() and priority > self.top_priority:
+                self.defer(priority)
+                continue
+
+            yield article
+
+    def defer(self, priority: float):
+        """Count one deferred article."""
+        key = 'none' if priority == math.inf else priority
+        self.deferred[key] = self.deferred.get(key, 0) + 1
+
+    def print_deferred(self):
+        """Print articles left undispatched because the time budget ran out."""
+        if not self.deferred:
+            return
+
+        print(f"⏳ Time budget exhausted, deferred {sum(self.deferred.values())} lower-priority articles:")
+        for priority, count in sorted(self.deferred.items(), key=lambda item: str(item[0])):
+            print(f"  Priority {priority}: {count} articles")
+        print()
@@ -0,0 +1,126 @@
+"""
+Workbook Cache Module
+Keeps a parsed copy of the input workbook next to the other caches so
+repeated runs skip the slow XLSX parse. Entries are keyed by the
+workbook's size, mtime and content hash and rebuilt whenever it changes.
+Parquet is used when pyarrow is installed, pickle otherwise.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class WorkbookCache:
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached sheets and their metadata
+        """
+        self.cache_dir = cache_dir
+        self.format = 'parquet' if importlib.util.find_spec('pyarrow') else 'pickle'
+
+    def paths(self, workbook_path: str) -> Dict[str, str]:
+        """
+        Get the cache file paths of a workbook.
+
+        Args:
+            workbook_path: Path to the source workbook
+
+        Returns:
+            Dictionary with 'meta', 'parquet' and 'pickle' paths
+        """
+        name = os.path.splitext(os.path.basename(workbook_path))[0]
+        digest = hashlib.sha1(os.path.abspath(workbook_path).encode('utf-8')).hexdigest()[:12]
+        base = os.path.join(self.cache_dir, f"{name}-{digest}")
+        return {'meta': base + '.json', 'parquet': base + '.parquet', 'pickle': base + '.pkl'}
+
+    @staticmethod
+    def file_hash(path: str) -> str:
+        """Hash a file's content in 1 MB chunks."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self, workbook_path: str) -> Optional[pd.DataFrame]:
+        """
+        Load the cached sheet if the workbook has not changed.
+
+        Size and mtime are checked first; when only the mtime differs the
+        content hash decides, so touching or re-saving an unchanged file
+        keeps the cache.
+
+        Args:
+            workbook_path: Path to the source workbook
+
+        Returns:
+            Cached DataFrame, or None on a miss
+        """
+        paths = self.paths(workbook_path)
+        try:
+            with open(paths['meta'], 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = os.stat(workbook_path)
+            if meta['size'] != stat.st_size:
+                return None
+            if meta['mtime_ns'] != stat.st_mtime_ns:
+                if meta['sha256'] != self.file_hash(workbook_path):
+                    return None
+                meta['mtime_ns'] = stat.st_mtime_ns
+                self.write_meta(paths['meta'], meta)
+
+            if meta['format'] == 'parquet':
+                return pd.read_parquet(paths['parquet'])
+            return pd.read_pickle(paths['pickle'])
+        except Exception:
+            # Missing, stale or unreadable entries are simply rebuilt
+            return None
+
+    def save(self, workbook_path: str, data: pd.DataFrame):
+        """
+        Store a freshly parsed sheet.
+
+        Args:
+            workbook_path: Path to the source workbook
+            data: Parsed sheet
+        """
+        paths = self.paths(workbook_path)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stat = os.stat(workbook_path)
+
+        file_format = self.format
+        try:
+            if file_format == 'parquet':
+                try:
+                    data.to_parquet(paths['parquet'] + '.tmp', index=True)
+                    os.replace(paths['parquet'] + '.tmp', paths['parquet'])
+                except Exception:
+                    # Mixed-type object columns cannot be written as Parquet
+                    file_format = 'pickle'
+            if file_format == 'pickle':
+                data.to_pickle(paths['pickle'] + '.tmp')
+                os.replace(paths['pickle'] + '.tmp', paths['pickle'])
+
+            self.write_meta(paths['meta'], {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': self.file_hash(workbook_path),
+                'format': file_format
+            })
+        except Exception as e:
+            print(f"⚠️  Could not write workbook cache: {str(e)}")
+
+    @staticmethod
+    def write_meta(path: str, meta: Dict):
+        """Atomically write the cache metadata."""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
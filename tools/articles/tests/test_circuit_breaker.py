@@ -0,0 +1,88 @@
+"""
+Only the half-open probe decides whether the circuit breaker closes again.
+
+Responses to requests sent before the breaker opened arrive late; they must
+neither close nor re-open the breaker.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules'))
+
+from retry_policy import CircuitBreaker
+
+
+def make_breaker() -> CircuitBreaker:
+    """A breaker that trips after 2 failures and stays open only briefly."""
+    return CircuitBreaker({'min_requests': 2, 'failure_threshold': 0.5, 'open_seconds': 0.01})
+
+
+async def open_then_probe(breaker: CircuitBreaker):
+    """Trip the breaker and return the token of the half-open probe."""
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    probe = await breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert probe is not None
+    return probe
+
+
+def test_late_outcomes_are_ignored_while_half_open():
+    async def run():
+        breaker = make_breaker()
+        probe = await open_then_probe(breaker)
+
+        # Late responses to requests sent before the breaker opened
+        breaker.record(True)
+        breaker.record(False)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.stats['trips'] == 1
+
+        breaker.record(True, probe)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(run())
+
+
+def test_failed_probe_reopens():
+    async def run():
+        breaker = make_breaker()
+        probe = await open_then_probe(breaker)
+
+        breaker.record(False, probe)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.stats['trips'] == 2
+
+        # A stale token from the previous half-open period is ignored too
+        breaker.record(True, probe)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    asyncio.run(run())
+
+
+def test_inconclusive_probe_lets_the_next_request_probe():
+    async def run():
+        breaker = make_breaker()
+        probe = await open_then_probe(breaker)
+
+        # A probe cancelled or answered with a 429 says nothing either way
+        breaker.record(None, probe)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        next_probe = await asyncio.wait_for(breaker.before_request(), timeout=1)
+        assert next_probe is not None and next_probe is not probe
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_late_outcomes_are_ignored_while_half_open()
+    test_failed_probe_reopens()
+    test_inconclusive_probe_lets_the_next_request_probe()
+    print("✅ Circuit breaker tests passed")
@@ -0,0 +1,76 @@
+"""
+Requests whose deadline runs out while they are queued are never sent.
+
+With the whole window dispatched but only two endpoint slots, and slow
+responses, most articles spend their whole deadline waiting for a slot; they must be given up without a request (and its token
+reservation and bill) instead of being sent with a token timeout.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+ARTICLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ARTICLES_DIR, 'modules'))
+
+from api_client import APIClient
+from mock_server import MockAPIServer
+
+
+def make_config(url: str) -> dict:
+    """Build a hermetic client config with two endpoint slots and a short deadline."""
+    with open(os.path.join(ARTICLES_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config.update({
+        'api_key': 'mock-key',
+        'api_base_url': url,
+        'concurrent_limit': 20,
+        'retry_attempts': 1,
+        'response_cache': {'enabled': False},
+        'cache_only': False,
+        'max_tokens_tuning': {'enabled': False},
+        'stream': False,
+        'candidates': {'count': 1},
+        'metrics': {'enabled': False},
+        'endpoints': []
+    })
+    config['rate_control'] = dict(config.get('rate_control', {}), initial_concurrency=2, additive_increase=0)
+    config['retry'] = dict(config.get('retry', {}), deadline_seconds=1.25, min_attempt_seconds=0.3)
+    config['transport'] = dict(config.get('transport', {}), prewarm=False)
+    config['hedging'] = dict(config.get('hedging', {}), enabled=False)
+    return config
+
+
+async def run_queued(num_prompts: int = 20) -> tuple:
+    """Generate num_prompts slow articles through two slots."""
+    server = MockAPIServer({'latency': 'fixed', 'latency_median': 0.5, 'seed': 1})
+    await server.start()
+    try:
+        client = APIClient(make_config(server.url))
+        prompts = [
+            (f"Deadline prompt {i}", {'title': f"Article {i}", 'url_path': f"/bench/article-{i}/"})
+            for i in range(num_prompts)
+        ]
+        results = await client.generate_articles_batch(prompts, batch_size=num_prompts)
+        return client, server, results
+    finally:
+        await server.stop()
+
+
+def test_expired_requests_are_not_sent():
+    client, server, results = asyncio.run(run_queued())
+
+    succeeded = sum(1 for _, content in results if content is not None)
+    # Every request that was sent had time to finish
+    assert server.stats['requests'] == succeeded
+    assert 2 <= succeeded < 20
+    assert client.stats['deadline_exceeded'] == 20 - succeeded
+
+
+if __name__ == "__main__":
+    test_expired_requests_are_not_sent()
+    print("✅ Deadline test passed")
@@ -0,0 +1,103 @@
+"""
+Failover between endpoints must not pause the healthy ones.
+
+Runs APIClient against two local mock servers, one of which answers every
+request with a 5xx, and checks that all articles are generated through the
+healthy endpoint without the circuit breaker ever tripping. Retries wait
+for the healthy endpoint instead of going back to the one that failed.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+ARTICLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ARTICLES_DIR, 'modules'))
+
+from api_client import APIClient
+from endpoint_pool import EndpointPool
+from mock_server import MockAPIServer
+
+
+def make_config(healthy_url: str, failing_url: str) -> dict:
+    """Build a hermetic client config with two endpoints."""
+    with open(os.path.join(ARTICLES_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config.update({
+        'api_key': 'mock-key',
+        'api_base_url': healthy_url,
+        'retry_delay': 0.05,
+        'response_cache': {'enabled': False},
+        'cache_only': False,
+        'max_tokens_tuning': {'enabled': False},
+        'stream': False,
+        'candidates': {'count': 1},
+        'metrics': {'enabled': False},
+        'endpoints': [
+            {'name': 'healthy', 'api_base_url': healthy_url, 'api_key': 'mock-key-1', 'concurrent_limit': 25},
+            {'name': 'failing', 'api_base_url': failing_url, 'api_key': 'mock-key-2', 'concurrent_limit': 25}
+        ]
+    })
+    config['transport'] = dict(config.get('transport', {}), prewarm=False)
+    config['hedging'] = dict(config.get('hedging', {}), enabled=False)
+    return config
+
+
+async def run_failover(num_prompts: int = 200) -> tuple:
+    """Generate num_prompts articles with one endpoint always failing."""
+    latency = {'latency': 'fixed', 'latency_median': 0.02, 'seed': 1}
+    healthy = MockAPIServer(dict(latency))
+    failing = MockAPIServer(dict(latency, rate_5xx=1.0))
+    await healthy.start()
+    await failing.start()
+    try:
+        client = APIClient(make_config(healthy.url, failing.url))
+        prompts = [
+            (f"Failover prompt {i}", {'title': f"Article {i}", 'url_path': f"/bench/article-{i}/"})
+            for i in range(num_prompts)
+        ]
+        results = await client.generate_articles_batch(prompts, batch_size=50)
+        return client, results
+    finally:
+        await healthy.stop()
+        await failing.stop()
+
+
+def test_failing_endpoint_does_not_trip_breaker():
+    client, results = asyncio.run(run_failover())
+
+    assert all(content is not None for _, content in results)
+    assert client.circuit_breaker.stats['trips'] == 0
+
+    failing = next(e for e in client.endpoint_pool.endpoints if e.name == 'failing')
+    assert failing.stats['failures'] > 0
+    assert failing.stats['ejections'] > 0
+
+
+def test_retry_waits_for_busy_healthy_endpoint():
+    config = make_config('http://127.0.0.1:1/healthy', 'http://127.0.0.1:1/failing')
+    config['endpoints'][0]['concurrent_limit'] = 1
+    pool = EndpointPool(config)
+    healthy, failing = pool.endpoints
+
+    # The healthy endpoint is busy: the retry waits instead of going back to the failed one
+    healthy.rate_controller.in_flight = 1
+    assert pool.pick(exclude={failing}) is None
+
+    # A free slot on the healthy endpoint is taken
+    healthy.rate_controller.in_flight = 0
+    assert pool.pick(exclude={failing}) is healthy
+
+    # With the healthy endpoint ejected, the excluded one is the only choice left
+    pool.eject(healthy)
+    assert pool.pick(exclude={failing}) is failing
+
+
+if __name__ == "__main__":
+    test_failing_endpoint_does_not_trip_breaker()
+    test_retry_waits_for_busy_healthy_endpoint()
+    print("✅ Failover test passed")
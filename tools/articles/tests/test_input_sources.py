@@ -0,0 +1,43 @@
+"""
+Table and streaming reads of a workbook must return the same rows.
+
+pd.read_excel() reads the first sheet; the streaming reader has to read the
+same one even when another sheet was active when the file was saved.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules'))
+
+import openpyxl
+
+from input_sources import XlsxSource
+
+
+def test_xlsx_stream_reads_first_sheet(tmp_path):
+    path = str(tmp_path / 'articles.xlsx')
+    workbook = openpyxl.Workbook()
+    first = workbook.active
+    first.append(['URL Path', 'Article Title'])
+    first.append(['/guides/first/', 'First'])
+    notes = workbook.create_sheet('Notes')
+    notes.append(['Note'])
+    notes.append(['not an article'])
+    workbook.active = 1
+    workbook.save(path)
+
+    source = XlsxSource(path)
+    frame = source.read_frame()
+    assert source.read_header() == list(frame.columns)
+    assert list(source.iter_rows()) == [tuple(row) for row in frame.itertuples(index=False)]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import pathlib
+    with tempfile.TemporaryDirectory() as directory:
+        test_xlsx_stream_reads_first_sheet(pathlib.Path(directory))
+    print("✅ Input source tests passed")
@@ -0,0 +1,60 @@
+"""
+Prompts carry a fixed date; the real one is set when the article is written.
+
+The prompt (and so its response cache key) must not change from day to day,
+while the saved article is still dated the day it was written.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import importlib.util
+import os
+import sys
+from datetime import datetime
+
+ARTICLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+spec = importlib.util.spec_from_file_location(
+    'generate_articles', os.path.join(ARTICLES_DIR, 'generate-articles.py')
+)
+generate_articles = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(generate_articles)
+
+
+class FakeLinks:
+    def select_links_for_article(self, url_path, num_links=2):
+        return []
+
+    def format_links_for_prompt(self, links):
+        return ''
+
+
+def make_generator():
+    generator = generate_articles.ArticleGenerator()
+    generator.links_manager = FakeLinks()
+    generator.article_template = "{url_path} {article_title} {keyword} {reference_link} {internal_links}date: \"{current_date}\""
+    return generator
+
+
+def test_prompt_does_not_contain_todays_date():
+    prompt = make_generator().build_prompt(
+        {'url_path': '/guides/a/', 'title': 'A', 'keyword': 'a', 'reference': None}
+    )
+    assert generate_articles.DATE_PLACEHOLDER in prompt
+    assert datetime.now().strftime('%Y-%m-%d') not in prompt
+
+
+def test_front_matter_date_is_set_on_save():
+    content = (
+        '---\ntitle: "A"\ndate: "YYYY-MM-DD"\n---\n\n'
+        'date: this body line is left alone\n'
+    )
+    stamped = make_generator().stamp_publish_date(content)
+    today = datetime.now().strftime('%Y-%m-%d')
+    assert stamped == content.replace('date: "YYYY-MM-DD"', f'date: "{today}"')
+
+
+if __name__ == "__main__":
+    test_prompt_does_not_contain_todays_date()
+    test_front_matter_date_is_set_on_save()
+    print("✅ Publish date tests passed")
@@ -0,0 +1,41 @@
+"""
+Continuations are joined without losing text.
+
+Only a repeat long enough to be deliberate is dropped; short accidental
+matches between the end of the output and the start of the continuation
+are part of the article.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'modules'))
+
+from api_client import stitch_continuation
+
+
+def test_short_accidental_matches_are_kept():
+    assert stitch_continuation('Beat the bos', 's fight') == 'Beat the boss fight'
+    assert stitch_continuation('It costs 1', '1 gold') == 'It costs 11 gold'
+    assert stitch_continuation('End of section.\n', '\n## Next') == 'End of section.\n\n## Next'
+
+
+def test_repeated_tail_is_dropped():
+    partial = 'Head north from the village until you reach the old watchtower'
+    continuation = 'until you reach the old watchtower, then climb to the top.'
+    assert stitch_continuation(partial, continuation) == (
+        'Head north from the village until you reach the old watchtower, then climb to the top.'
+    )
+
+
+def test_no_overlap_is_appended():
+    assert stitch_continuation('First part.', ' Second part.') == 'First part. Second part.'
+
+
+if __name__ == "__main__":
+    test_short_accidental_matches_are_kept()
+    test_repeated_tail_is_dropped()
+    test_no_overlap_is_appended()
+    print("✅ Continuation stitching tests passed")
@@ -0,0 +1,70 @@
+"""
+Token-budget admission must reserve the completion of every candidate.
+
+A request with n parallel candidates can be billed n * max_tokens completion
+tokens; reserving a single completion lets a TPM-limited endpoint overshoot
+its quota.
+
+Usage:
+    python -m pytest tools/articles/tests
+"""
+import asyncio
+import json
+import os
+import sys
+
+ARTICLES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ARTICLES_DIR, 'modules'))
+
+from api_client import APIClient
+from mock_server import MockAPIServer
+from token_budget import estimate_tokens
+
+
+def make_config(url: str, candidates: int) -> dict:
+    """Build a hermetic client config with a TPM-limited endpoint."""
+    with open(os.path.join(ARTICLES_DIR, 'config.json'), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config.update({
+        'api_key': 'mock-key',
+        'api_base_url': url,
+        'max_tokens': 1000,
+        'tokens_per_minute': 10000000,
+        'response_cache': {'enabled': False},
+        'cache_only': False,
+        'max_tokens_tuning': {'enabled': False},
+        'stream': False,
+        'candidates': {'count': candidates, 'mode': 'parallel'},
+        'metrics': {'enabled': False},
+        'endpoints': []
+    })
+    config['transport'] = dict(config.get('transport', {}), prewarm=False)
+    config['hedging'] = dict(config.get('hedging', {}), enabled=False)
+    return config
+
+
+async def reserved_tokens(candidates: int) -> tuple:
+    """Generate one article and return (tokens reserved, prompt estimate)."""
+    server = MockAPIServer({'latency': 'fixed', 'latency_median': 0.01, 'seed': 1})
+    await server.start()
+    try:
+        client = APIClient(make_config(server.url, candidates))
+        prompt = "Token budget prompt"
+        await client.generate_articles_batch(
+            [(prompt, {'title': 'Article', 'url_path': '/bench/article/'})], batch_size=1
+        )
+        budget = client.endpoint_pool.endpoints[0].token_budget
+        return budget.stats['reserved_tokens'], estimate_tokens(client.system_message + prompt)
+    finally:
+        await server.stop()
+
+
+def test_reservation_covers_every_candidate():
+    reserved, prompt_estimate = asyncio.run(reserved_tokens(3))
+    assert reserved == prompt_estimate + 3 * 1000
+
+
+if __name__ == "__main__":
+    test_reservation_covers_every_candidate()
+    print("✅ Token budget test passed")